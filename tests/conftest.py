@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -30,8 +32,39 @@ if FILENAME not in project_dir_content:
 pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
+    'tests.fixtures.fixture_perf',
 ]
 
+
+@pytest.fixture(autouse=True)
+def throttle_storage(settings, tmp_path):
+    from api.throttling import get_throttle_storage
+
+    # Тесты не должны писать в файл счётчиков рабочего окружения.
+    backend = 'api.throttling.SQLiteThrottleStorage'
+    if settings.THROTTLE_STORAGE['BACKEND'] == backend:
+        settings.THROTTLE_STORAGE = {
+            **settings.THROTTLE_STORAGE,
+            'LOCATION': tmp_path / 'throttle.sqlite3',
+        }
+    get_throttle_storage.cache_clear()
+    yield get_throttle_storage()
+    get_throttle_storage.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(throttle_storage):
+    from django.core.cache import cache
+
+    from api.throttling import get_throttle_storage
+
+    cache.clear()
+    get_throttle_storage().clear()
+    yield
+    cache.clear()
+    get_throttle_storage().clear()
+
+
 # test .md
 default_md = '# api_final\napi final\n'
 filename = 'README.md'
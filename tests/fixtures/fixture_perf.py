@@ -0,0 +1,309 @@
+import json
+import os
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Follow, Group, Post
+
+
+PERF_ENABLED = bool(os.getenv('YATUBE_PERF'))
+PERF_SCALE = float(os.getenv('YATUBE_PERF_SCALE', '1'))
+PERF_TOLERANCE = float(os.getenv('YATUBE_PERF_TOLERANCE', '1.5'))
+PERF_MEMORY_SLACK_KB = float(os.getenv('YATUBE_PERF_MEMORY_SLACK_KB', '1024'))
+PERF_UPDATE = bool(os.getenv('YATUBE_PERF_UPDATE'))
+BASELINE_PATH = Path(os.getenv(
+    'YATUBE_PERF_BASELINE',
+    Path(__file__).resolve().parent.parent / 'perf_baseline.json'
+))
+# Число запросов не зависит от машины, поэтому его базовые значения для
+# полного масштаба хранятся в репозитории; время и память — только локально.
+QUERIES_PATH = Path(__file__).resolve().parent.parent / 'perf_queries.json'
+
+USERS = 1000
+POSTS = 10000
+COMMENTS = 100000
+GROUPS = 20
+FOLLOWS_PER_USER = 20
+BATCH_SIZE = 5000
+
+perf_only = pytest.mark.skipif(
+    not PERF_ENABLED,
+    reason='Тесты производительности запускаются с YATUBE_PERF=1.'
+)
+
+
+def scaled(amount):
+    return max(1, int(amount * PERF_SCALE))
+
+
+def load_metrics(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'p99_ms': round(
+            latencies[int(len(latencies) * 0.99) - 1] * 1000, 3
+        ),
+    }
+
+
+def measure(call, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        cache.clear()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    cache.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as context:
+        call()
+    traced = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'queries': len(context.captured_queries),
+        'time_ms': round(statistics.median(timings or [traced]) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def rss_kb(field):
+    status = Path('/proc/self/status').read_text()
+    return int(re.search(rf'{field}:\s+(\d+) kB', status).group(1))
+
+
+def measure_rss(call):
+    clear_refs = Path('/proc/self/clear_refs')
+    if not clear_refs.exists():
+        pytest.skip('Замер пиковой памяти процесса доступен только в Linux.')
+    clear_refs.write_text('5')
+    before = rss_kb('VmRSS')
+    start = time.perf_counter()
+    call()
+    return {
+        'time_ms': round((time.perf_counter() - start) * 1000, 3),
+        'rss_peak_kb': rss_kb('VmHWM') - before,
+    }
+
+
+class PerfBaseline:
+    def __init__(self, path, queries_path=None):
+        self.path = path
+        self.saved = {}
+        if path.exists():
+            self.saved = json.loads(path.read_text())
+        self.queries_path = queries_path
+        self.saved_queries = {}
+        if queries_path is not None and queries_path.exists():
+            self.saved_queries = json.loads(queries_path.read_text())
+        self.results = {}
+
+    def check_queries(self, name, metrics):
+        if self.queries_path is None or 'queries' not in metrics:
+            return []
+        saved = self.saved_queries.get(name)
+        if saved is None:
+            return [
+                f'{name}: нет базового числа SQL-запросов в '
+                f'{self.queries_path.name}, запустите с YATUBE_PERF_UPDATE=1'
+            ]
+        if metrics['queries'] > saved:
+            return [f'{name}: {metrics["queries"]} SQL-запросов вместо {saved}']
+        return []
+
+    def check(self, name, metrics):
+        self.results[name] = metrics
+        if PERF_UPDATE:
+            return []
+        regressions = self.check_queries(name, metrics)
+        saved = self.saved.get(name)
+        if saved is None:
+            return regressions
+        for key, value in metrics.items():
+            if key not in saved:
+                continue
+            if key == 'queries' and self.queries_path is not None:
+                continue
+            if key == 'queries' and value > saved[key]:
+                regressions.append(
+                    f'{name}: {value} SQL-запросов вместо {saved[key]}'
+                )
+            elif key.endswith('_per_s') and (
+                value * PERF_TOLERANCE < saved[key]
+            ):
+                regressions.append(
+                    f'{name}: {key} {value} меньше базового {saved[key]} '
+                    f'более чем в {PERF_TOLERANCE} раза'
+                )
+            elif key.endswith('_kb') and (
+                value <= saved[key] + PERF_MEMORY_SLACK_KB
+            ):
+                continue
+            elif key != 'queries' and not key.endswith('_per_s') and (
+                value > saved[key] * PERF_TOLERANCE
+            ):
+                regressions.append(
+                    f'{name}: {key} {value} больше базового {saved[key]} '
+                    f'более чем в {PERF_TOLERANCE} раза'
+                )
+        return regressions
+
+    def save(self):
+        if not self.results:
+            return
+        merged = dict(self.saved)
+        for name, metrics in self.results.items():
+            if PERF_UPDATE or name not in merged:
+                merged[name] = metrics
+        write_json(self.path, merged)
+        if self.queries_path is not None and PERF_UPDATE:
+            queries = dict(self.saved_queries)
+            for name, metrics in self.results.items():
+                if 'queries' in metrics:
+                    queries[name] = metrics['queries']
+            write_json(self.queries_path, queries)
+
+
+def write_json(path, data):
+    path.write_text(
+        json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + '\n'
+    )
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix,
+                                 tmp_path_factory):
+    from django.conf import settings
+
+    database = settings.DATABASES['default']
+    if PERF_ENABLED and database['ENGINE'] == 'yatube_api.sqlite3':
+        # Конкурентные записи проверяются на файле в режиме WAL, как в
+        # рабочем профиле, а не на общей базе в памяти.
+        database.setdefault('TEST', {})['NAME'] = str(
+            tmp_path_factory.mktemp('perf_db') / 'perf.sqlite3'
+        )
+
+
+@pytest.fixture(scope='session')
+def perf_baseline():
+    # Число запросов части маршрутов растёт с объёмом данных, поэтому
+    # общий базовый файл применяется только к полному масштабу.
+    baseline = PerfBaseline(
+        BASELINE_PATH, QUERIES_PATH if PERF_SCALE == 1 else None
+    )
+    yield baseline
+    baseline.save()
+
+
+@pytest.fixture(scope='module')
+def perf_data(django_db_setup, django_db_blocker):
+    User = get_user_model()
+    with django_db_blocker.unblock():
+        User.objects.bulk_create(
+            (
+                User(username=f'perf_user_{number}', password='!')
+                for number in range(scaled(USERS))
+            ),
+            batch_size=BATCH_SIZE
+        )
+        users = list(User.objects.filter(username__startswith='perf_user_'))
+        Group.objects.bulk_create(
+            Group(title=f'Группа {number}', slug=f'perf_group_{number}')
+            for number in range(GROUPS)
+        )
+        groups = list(Group.objects.filter(slug__startswith='perf_group_'))
+        follows_per_user = min(FOLLOWS_PER_USER, len(users) - 1)
+        Follow.objects.bulk_create(
+            (
+                Follow(
+                    user=user,
+                    following=users[(index + step) % len(users)]
+                )
+                for index, user in enumerate(users)
+                for step in range(1, follows_per_user + 1)
+            ),
+            batch_size=BATCH_SIZE
+        )
+        Post.objects.bulk_create(
+            (
+                Post(
+                    text=f'Пост номер {number}',
+                    author=users[number % len(users)],
+                    group=groups[number % len(groups)]
+                )
+                for number in range(scaled(POSTS))
+            ),
+            batch_size=BATCH_SIZE
+        )
+        post_ids = list(
+            Post.objects.filter(
+                author__username__startswith='perf_user_'
+            ).values_list('id', flat=True)
+        )
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    text=f'Комментарий {number}',
+                    author=users[number % len(users)],
+                    post_id=post_ids[number % len(post_ids)]
+                )
+                for number in range(scaled(COMMENTS))
+            ),
+            batch_size=BATCH_SIZE
+        )
+        post = Post.objects.get(id=post_ids[0])
+        data = {
+            'user': users[0],
+            'users': users,
+            'groups': groups,
+            'post': post,
+            'comment': post.comments.first(),
+        }
+    yield data
+    with django_db_blocker.unblock():
+        Group.objects.filter(slug__startswith='perf_group_').delete()
+        User.objects.filter(username__startswith='perf_user_').delete()
+
+
+@pytest.fixture(scope='module')
+def viral_post(perf_data, django_db_blocker):
+    with django_db_blocker.unblock():
+        users = perf_data['users']
+        post = Post.objects.create(
+            text='Популярный пост', author=perf_data['user']
+        )
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    text=f'Комментарий {number}',
+                    author=users[number % len(users)],
+                    post=post
+                )
+                for number in range(scaled(COMMENTS))
+            ),
+            batch_size=BATCH_SIZE
+        )
+    yield post
+    with django_db_blocker.unblock():
+        post.delete()
+
+
+@pytest.fixture
+def perf_client(perf_data):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    token = RefreshToken.for_user(perf_data['user']).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
@@ -0,0 +1,104 @@
+import asyncio
+from http import HTTPStatus
+from types import ModuleType
+
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+import pytest
+
+from api.async_views import async_read_urls
+from api.urls import router_v1
+
+ASYNC_ROUTES = (
+    'posts-list', 'posts-detail', 'comments-list', 'comments-detail',
+    'groups-list', 'groups-detail'
+)
+
+
+def async_urlconf():
+    urlconf = ModuleType('async_urls')
+    urlconf.urlpatterns = [
+        path('api/v1/', include(async_read_urls(router_v1.urls,
+                                                ASYNC_ROUTES))),
+    ]
+    return urlconf
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadRoutes:
+
+    def test_selected_routes_async(self):
+        patterns = {
+            pattern.name: pattern
+            for pattern in async_read_urls(router_v1.urls, ('posts-list',))
+        }
+        assert asyncio.iscoroutinefunction(patterns['posts-list'].callback), (
+            'Проверьте, что выбранный маршрут получает асинхронное '
+            'представление.'
+        )
+        assert not asyncio.iscoroutinefunction(
+            patterns['follow-list'].callback
+        )
+        assert getattr(patterns['posts-list'].callback, 'csrf_exempt', False)
+
+    @pytest.mark.parametrize('overrides', (
+        {},
+        {'PROFILING_ENABLED': True,
+         'DATABASE_REPLICAS': {'replica_0': {}}},
+    ))
+    def test_asgi_chain_not_wrapped(self, overrides):
+        with override_settings(**overrides):
+            chain = ASGIHandler()._middleware_chain
+        assert asyncio.iscoroutinefunction(chain), (
+            'Проверьте, что под ASGI цепочка middleware остаётся '
+            'асинхронной.'
+        )
+        assert not isinstance(chain, SyncToAsync), (
+            'Проверьте, что собственные middleware поддерживают async и '
+            'цепочка не оборачивается в SyncToAsync.'
+        )
+
+    def test_async_matches_sync(self, client, post, another_post,
+                                comment_1_post, group_1):
+        urls = (
+            '/api/v1/posts/',
+            '/api/v1/posts/?limit=1&offset=1',
+            f'/api/v1/posts/{post.id}/',
+            f'/api/v1/posts/{post.id}/comments/',
+            f'/api/v1/posts/{post.id}/comments/{comment_1_post.id}/',
+            '/api/v1/groups/',
+            f'/api/v1/groups/{group_1.id}/',
+        )
+        expected = [client.get(url).json() for url in urls]
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            async_client = AsyncClient()
+
+            async def fetch_all():
+                return await asyncio.gather(
+                    *(async_client.get(url) for url in urls)
+                )
+
+            responses = async_to_sync(fetch_all)()
+        for url, response, data in zip(urls, responses, expected):
+            assert response.status_code == HTTPStatus.OK
+            assert response.json() == data, (
+                f'Проверьте, что асинхронный маршрут `{url}` отвечает так же, '
+                'как синхронный.'
+            )
+
+    def test_async_route_keeps_writes(self, user, token, post):
+        async def create():
+            return await AsyncClient().post(
+                '/api/v1/posts/',
+                data={'text': 'Асинхронный пост'},
+                content_type='application/json',
+                authorization=f'Bearer {token["access"]}'
+            )
+
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            response = async_to_sync(create)()
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись через асинхронный маршрут работает.'
+        )
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from api.cache import user_cache
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedJWTAuthentication:
+
+    url = '/api/v1/follow/'
+
+    def count_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url)
+        return response, len(context.captured_queries)
+
+    def test_user_lookup_cached(self, user_client):
+        _, cold = self.count_queries(user_client)
+        response, warm = self.count_queries(user_client)
+        assert response.status_code == HTTPStatus.OK
+        assert warm == cold - 1, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из базы данных.'
+        )
+
+    def test_deactivated_user_rejected(self, user_client, user):
+        self.count_queries(user_client)
+        user.is_active = False
+        user.save()
+        response, _ = self.count_queries(user_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после отключения учётной записи её токен '
+            'перестаёт приниматься, несмотря на кэш.'
+        )
+
+    def test_password_change_invalidates(self, user_client, user):
+        self.count_queries(user_client)
+        user.set_password('new-password-123')
+        user.save()
+        _, queries = self.count_queries(user_client)
+        _, cached = self.count_queries(user_client)
+        assert queries == cached + 1, (
+            'Проверьте, что смена пароля сбрасывает пользователя в кэше '
+            'аутентификации.'
+        )
+
+    def test_invalidated_after_commit(self, user_client, user):
+        self.count_queries(user_client)
+        with transaction.atomic():
+            user.is_active = False
+            user.save()
+            assert user_cache.get(user.id) is not None, (
+                'Проверьте, что пользователь сбрасывается в кэше только '
+                'после фиксации транзакции.'
+            )
+        assert user_cache.get(user.id) is None
+
+    def test_deleted_user_rejected(self, user_client, user):
+        self.count_queries(user_client)
+        user.delete()
+        response, _ = self.count_queries(user_client)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_shared_stamp_checked(self, user_client):
+        self.count_queries(user_client)
+        cache.clear()
+        _, queries = self.count_queries(user_client)
+        _, cached = self.count_queries(user_client)
+        assert queries == cached + 1, (
+            'Проверьте, что запись кэша сбрасывается, если её метка в общем '
+            'кэше исчезла или изменилась в другом процессе.'
+        )
+
+    def test_lru_bounded(self, django_user_model, monkeypatch):
+        monkeypatch.setattr(user_cache, 'max_size', 2)
+        users = [
+            django_user_model.objects.create(username=f'lru_{number}')
+            for number in range(3)
+        ]
+        for user in users:
+            user_cache.set(user.pk, user, user_cache.get_stamp(user.pk))
+        assert len(user_cache.entries) == 2
+        assert user_cache.get(users[0].pk) is None
+        assert user_cache.get(users[2].pk).username == 'lru_2'
+
+    def test_stamp_read_before_load(self, user):
+        stamp = user_cache.get_stamp(user.pk)
+        user.save()
+        user_cache.set(user.pk, user, stamp)
+        assert user_cache.get(user.pk) is None, (
+            'Проверьте, что пользователь, изменённый после получения метки, '
+            'не сохраняется в кэше как актуальный.'
+        )
+
+    def test_expired_entry_dropped(self, user, monkeypatch):
+        user_cache.set(user.pk, user, user_cache.get_stamp(user.pk))
+        monkeypatch.setattr(user_cache, 'timeout', -1)
+        user_cache.set(user.pk, user, user_cache.get_stamp(user.pk))
+        assert user_cache.get(user.pk) is None
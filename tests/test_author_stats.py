@@ -0,0 +1,165 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import AuthorStats, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuthorStats:
+
+    user_url = '/api/v1/users/{username}/'
+
+    def get_stats(self, client, user):
+        url = self.user_url.format(username=user.username)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert len(context.captured_queries) == 1, (
+            f'Проверьте, что `{url}` отдаёт счётчики одним SQL-запросом.'
+        )
+        data = response.json()
+        return (
+            data['followers_count'], data['following_count'],
+            data['posts_count']
+        )
+
+    def test_not_found(self, client):
+        response = client.get(self.user_url.format(username='nobody'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_counts_follow_api_writes(self, user_client, client, user,
+                                      another_user):
+        assert self.get_stats(client, user) == (0, 0, 0)
+        response = user_client.post(
+            '/api/v1/follow/', data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        for _ in range(2):
+            response = user_client.post(
+                '/api/v1/posts/', data={'text': 'Пост'}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+        assert self.get_stats(client, user) == (0, 1, 2), (
+            'Проверьте, что подписка и создание постов обновляют счётчики '
+            'пользователя.'
+        )
+        assert self.get_stats(client, another_user) == (1, 0, 0)
+
+        post_id = response.json()['id']
+        response = user_client.delete(f'/api/v1/posts/{post_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        Follow.objects.filter(user=user).delete()
+        assert self.get_stats(client, user) == (0, 0, 1), (
+            'Проверьте, что удаление поста и подписки уменьшает счётчики.'
+        )
+        assert self.get_stats(client, another_user) == (0, 0, 0)
+
+    def test_bulk_create(self, user_client, client, user):
+        response = user_client.post(
+            '/api/v1/posts/bulk/',
+            data=[{'text': f'Пост {number}'} for number in range(3)],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_stats(client, user) == (0, 0, 3), (
+            'Проверьте, что пакетное создание постов обновляет счётчик.'
+        )
+
+    def test_missing_row_restored(self, client, user, another_user, post):
+        AuthorStats.objects.filter(user=user).delete()
+        assert self.get_stats(client, user) == (0, 0, 0)
+        Follow.objects.create(user=another_user, following=user)
+        assert self.get_stats(client, user) == (1, 0, 1), (
+            'Проверьте, что строка счётчиков создаётся по фактическим '
+            'данным.'
+        )
+
+    def test_user_delete_cascade(self, client, user, another_user, post):
+        Follow.objects.create(user=user, following=another_user)
+        Follow.objects.create(user=another_user, following=user)
+        user.delete()
+        assert self.get_stats(client, another_user) == (0, 0, 0)
+        assert not AuthorStats.objects.filter(user_id=user.id).exists()
+
+    def test_user_delete_queries(self, django_user_model, another_user):
+        counts = []
+        for posts in (1, 50):
+            author = django_user_model.objects.create_user(
+                username=f'author_{posts}'
+            )
+            Post.objects.bulk_create(
+                Post(text='Пост', author=author) for _ in range(posts)
+            )
+            Follow.objects.create(user=author, following=another_user)
+            with CaptureQueriesContext(connection) as context:
+                author.delete()
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что удаление пользователя не обновляет счётчики и '
+            f'версии отдельно для каждого поста: {counts}.'
+        )
+        assert AuthorStats.objects.get(user=another_user).followers_count == 0
+
+    def test_posts_delete_aggregated(self, client, user, another_user):
+        Post.objects.bulk_create(
+            Post(text='Пост', author=author)
+            for author in (user, another_user) for _ in range(5)
+        )
+        AuthorStats.objects.filter(user__in=(user, another_user)).update(
+            posts_count=5
+        )
+        with CaptureQueriesContext(connection) as context:
+            Post.objects.all().delete()
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "posts_authorstats"')
+        ]
+        assert len(updates) == 2, (
+            'Проверьте, что счётчик постов уменьшается одним UPDATE на '
+            'автора.'
+        )
+        assert self.get_stats(client, user)[2] == 0
+        assert self.get_stats(client, another_user)[2] == 0
+
+    def test_rolled_back_delete_not_counted(self, client, user, post):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                post.delete()
+                raise RuntimeError
+        Post.objects.create(text='Пост', author=user).delete()
+        assert self.get_stats(client, user)[2] == 1, (
+            'Проверьте, что удаление из отменённой транзакции не '
+            'уменьшает счётчики.'
+        )
+
+    def test_recount_command(self, user, another_user, post, follow_1):
+        AuthorStats.objects.filter(user=user).update(posts_count=7)
+        AuthorStats.objects.filter(user=another_user).delete()
+        out = StringIO()
+        call_command('recount_author_stats', '--dry-run', stdout=out)
+        assert 'Расхождений: 2' in out.getvalue()
+        assert AuthorStats.objects.get(user=user).posts_count == 7
+
+        call_command('recount_author_stats', stdout=StringIO())
+        counts = {
+            stats.user_id: (
+                stats.followers_count, stats.following_count,
+                stats.posts_count
+            )
+            for stats in AuthorStats.objects.all()
+        }
+        assert counts == {
+            user.id: (0, 1, 1), another_user.id: (1, 0, 0)
+        }, (
+            'Проверьте, что команда `recount_author_stats` исправляет '
+            'расхождения счётчиков.'
+        )
+        assert Post.objects.count() == 1
@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Comment, Post
+
+
+MISSING_POST_ID = 999
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentQueries:
+
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+
+    @pytest.fixture(autouse=True)
+    def warm_up(self, user_client):
+        # Первый запрос загружает пользователя в кэш аутентификации.
+        user_client.get('/api/v1/posts/')
+
+    def request(self, client, method, url, expected_status, expected_queries,
+                data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, data=data)
+        assert response.status_code == expected_status, (
+            f'Проверьте, что {method.upper()}-запрос к `{url}` возвращает '
+            f'ответ со статусом {expected_status}.'
+        )
+        queries = [query['sql'] for query in context.captured_queries]
+        assert len(queries) == expected_queries, (
+            f'Проверьте, что {method.upper()}-запрос к `{url}` выполняет '
+            f'{expected_queries} SQL-запрос(а), выполнено {len(queries)}.'
+        )
+        assert not any('"posts_post"."text"' in sql for sql in queries), (
+            f'Проверьте, что {method.upper()}-запрос к `{url}` не загружает '
+            'пост целиком.'
+        )
+        return response
+
+    def test_list(self, user_client, post, comment_1_post, another_post):
+        self.request(
+            user_client, 'get', self.comments_url.format(post_id=post.id),
+            HTTPStatus.OK, 2
+        )
+        # Пустая страница не доказывает, что пост есть: нужна проверка.
+        self.request(
+            user_client, 'get',
+            self.comments_url.format(post_id=another_post.id),
+            HTTPStatus.OK, 3
+        )
+        self.request(
+            user_client, 'get',
+            self.comments_url.format(post_id=MISSING_POST_ID),
+            HTTPStatus.NOT_FOUND, 3
+        )
+
+    def test_retrieve(self, user_client, post, comment_1_post):
+        self.request(
+            user_client, 'get', self.comment_url.format(
+                post_id=post.id, comment_id=comment_1_post.id
+            ),
+            HTTPStatus.OK, 2
+        )
+        self.request(
+            user_client, 'get', self.comment_url.format(
+                post_id=MISSING_POST_ID, comment_id=comment_1_post.id
+            ),
+            HTTPStatus.NOT_FOUND, 2
+        )
+
+    def test_create(self, user_client, post, comment_1_post):
+        response = self.request(
+            user_client, 'post', self.comments_url.format(post_id=post.id),
+            HTTPStatus.CREATED, 5, data={'text': 'Комментарий'}
+        )
+        assert response.json()['post'] == post.id
+        self.request(
+            user_client, 'post',
+            self.comments_url.format(post_id=MISSING_POST_ID),
+            HTTPStatus.NOT_FOUND, 2, data={'text': 'Комментарий'}
+        )
+        assert Comment.objects.count() == 2, (
+            'Проверьте, что комментарий к несуществующему посту не '
+            'создаётся.'
+        )
+        post.refresh_from_db()
+        assert post.comments_count == 1
+
+    @pytest.mark.parametrize('method', ['put', 'patch'])
+    def test_update(self, user_client, post, comment_1_post, method):
+        self.request(
+            user_client, method, self.comment_url.format(
+                post_id=post.id, comment_id=comment_1_post.id
+            ),
+            HTTPStatus.OK, 3, data={'text': 'Новый текст'}
+        )
+
+    def test_destroy(self, user_client, post, comment_1_post):
+        self.request(
+            user_client, 'delete', self.comment_url.format(
+                post_id=MISSING_POST_ID, comment_id=comment_1_post.id
+            ),
+            HTTPStatus.NOT_FOUND, 1
+        )
+        self.request(
+            user_client, 'delete', self.comment_url.format(
+                post_id=post.id, comment_id=comment_1_post.id
+            ),
+            HTTPStatus.NO_CONTENT, 6
+        )
+
+    def test_post_delete_cascade(self, user_client, user):
+        counts = []
+        for comments in (1, 200):
+            post = Post.objects.create(text='Пост', author=user)
+            Comment.objects.bulk_create(
+                Comment(text='Комментарий', author=user, post=post)
+                for _ in range(comments)
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.delete(f'/api/v1/posts/{post.id}/')
+            assert response.status_code == HTTPStatus.NO_CONTENT
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что комментарии удаляются вместе с постом одним '
+            'запросом, без загрузки и сигнала на каждый комментарий: '
+            f'{counts}.'
+        )
+        assert not Comment.objects.exists()
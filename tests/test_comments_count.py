@@ -0,0 +1,92 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+import pytest
+
+from api.serializers import PostSerializer
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommentsCount:
+
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_detail_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def get_count(self, client, post):
+        response = client.get(self.post_detail_url.format(post_id=post.id))
+        assert 'comments_count' in response.json(), (
+            'Проверьте, что ответ с данными поста содержит поле '
+            '`comments_count`.'
+        )
+        return response.json()['comments_count']
+
+    def test_count_follows_api_writes(self, user_client, post, another_post):
+        for _ in range(2):
+            response = user_client.post(
+                self.comments_url.format(post_id=post.id),
+                data={'text': 'Комментарий'}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+        assert self.get_count(user_client, post) == 2, (
+            'Проверьте, что создание комментария увеличивает '
+            '`comments_count` поста.'
+        )
+        assert self.get_count(user_client, another_post) == 0
+
+        comment = Comment.objects.filter(post=post).first()
+        response = user_client.delete(self.comment_detail_url.format(
+            post_id=post.id, comment_id=comment.id
+        ))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_count(user_client, post) == 1, (
+            'Проверьте, что удаление комментария уменьшает '
+            '`comments_count` поста.'
+        )
+
+    def test_count_read_only(self, user_client, post):
+        response = user_client.patch(
+            self.post_detail_url.format(post_id=post.id),
+            data={'comments_count': 100}
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.comments_count == 0, (
+            'Проверьте, что поле `comments_count` доступно только для чтения.'
+        )
+
+    def test_update_keeps_concurrent_count(self, post):
+        stale = Post.objects.get(id=post.id)
+        Post.objects.filter(id=post.id).update(
+            comments_count=F('comments_count') + 1
+        )
+        serializer = PostSerializer(
+            stale, data={'text': 'Новый текст'}, partial=True
+        )
+        assert serializer.is_valid()
+        serializer.save()
+        post.refresh_from_db()
+        assert post.text == 'Новый текст'
+        assert post.comments_count == 1, (
+            'Проверьте, что изменение поста сохраняет только переданные '
+            'поля и не затирает `comments_count`.'
+        )
+
+    def test_recount_command(self, post, another_post, comment_1_post,
+                             comment_2_post):
+        Post.objects.filter(id=another_post.id).update(comments_count=5)
+        out = StringIO()
+        call_command('recount_comments', '--dry-run', stdout=out)
+        assert 'Расхождений: 2' in out.getvalue()
+        post.refresh_from_db()
+        assert post.comments_count == 0
+
+        call_command('recount_comments', stdout=StringIO())
+        counts = dict(Post.objects.values_list('id', 'comments_count'))
+        assert counts == {post.id: 2, another_post.id: 0}, (
+            'Проверьте, что команда `recount_comments` исправляет '
+            'расхождения счётчиков.'
+        )
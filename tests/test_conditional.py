@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+import pytest
+
+from posts.models import Comment, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    group_list_url = '/api/v1/groups/'
+
+    def get_validators(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что ответ не содержит заголовок `Last-Modified` с '
+            'точностью в секунду.'
+        )
+        return response['ETag']
+
+    def assert_not_modified(self, client, url, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, **headers)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что повторный GET-запрос к `{url}` с валидатором '
+            'кэша возвращает ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что ответ 304 не выполняет выборку записей.'
+        )
+
+    def test_posts_not_modified(self, client, post):
+        etag = self.get_validators(client, self.post_list_url)
+        self.assert_not_modified(
+            client, self.post_list_url, HTTP_IF_NONE_MATCH=etag
+        )
+
+    def test_posts_modified_after_write(self, client, user, post):
+        url = self.post_detail_url.format(post_id=post.id)
+        etag = self.get_validators(client, url)
+        Post.objects.create(text='Новый пост', author=user)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения постов условный GET-запрос '
+            'возвращает актуальные данные.'
+        )
+        assert response['ETag'] != etag
+
+    def test_write_in_same_second(self, client, user, post):
+        self.get_validators(client, self.post_list_url)
+        new_post = Post.objects.create(text='Новый пост', author=user)
+        response = client.get(
+            self.post_list_url,
+            HTTP_IF_MODIFIED_SINCE=http_date(new_post.pub_date.timestamp())
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `If-Modified-Since` с той же секундой, что и '
+            'запись, не приводит к устаревшему ответу 304.'
+        )
+        assert new_post.id in [item['id'] for item in response.json()], (
+            'Проверьте, что ответ содержит пост, созданный в ту же секунду.'
+        )
+
+    def test_etag_depends_on_query(self, client, post):
+        etag = self.get_validators(client, self.post_list_url)
+        response = client.get(
+            f'{self.post_list_url}?limit=1', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_comments_not_modified(self, client, user_client, post,
+                                   another_post, comment_1_post):
+        url = self.comments_url.format(post_id=post.id)
+        etag = self.get_validators(client, url)
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+        Comment.objects.create(
+            author=another_post.author, post=another_post, text='Другой'
+        )
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+        user_client.delete(f'{url}{comment_1_post.id}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_deleted_post_comments(self, client, post, comment_1_post):
+        url = self.comments_url.format(post_id=post.id)
+        etag = self.get_validators(client, url)
+        post.delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_groups_not_modified(self, client, group_1):
+        etag = self.get_validators(client, self.group_list_url)
+        self.assert_not_modified(
+            client, self.group_list_url, HTTP_IF_NONE_MATCH=etag
+        )
+        Group.objects.create(title='Группа 3', slug='group_3')
+        response = client.get(self.group_list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
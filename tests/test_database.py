@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+import pytest
+
+from yatube_api.sqlite3.base import DatabaseWrapper
+
+
+def make_wrapper(path, **options):
+    settings_dict = {
+        **settings.DATABASE_PROFILES['sqlite'],
+        'NAME': str(path),
+        'OPTIONS': {
+            **settings.DATABASE_PROFILES['sqlite']['OPTIONS'], **options
+        },
+        'TIME_ZONE': None,
+        'AUTOCOMMIT': True,
+        'ATOMIC_REQUESTS': False,
+        'CONN_MAX_AGE': 0,
+        'TEST': {},
+    }
+    return DatabaseWrapper(settings_dict, alias='profile_test')
+
+
+class TestSQLiteProfile:
+
+    @pytest.fixture(autouse=True)
+    def unblock(self, django_db_blocker):
+        # Соединения к отдельным файлам, тестовая база не используется.
+        with django_db_blocker.unblock():
+            yield
+
+    def test_pragmas_applied(self, tmp_path):
+        wrapper = make_wrapper(tmp_path / 'db.sqlite3')
+        with wrapper.cursor() as cursor:
+            values = {
+                name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in ('journal_mode', 'busy_timeout', 'temp_store')
+            }
+        wrapper.close()
+        assert values == {
+            'journal_mode': 'wal',
+            'busy_timeout': settings.DATABASE_PROFILES['sqlite']['OPTIONS'][
+                'pragmas'
+            ]['busy_timeout'],
+            'temp_store': 2,
+        }, (
+            'Проверьте, что PRAGMA из профиля выполняются при открытии '
+            'соединения.'
+        )
+
+    def test_unknown_transaction_mode(self, tmp_path):
+        wrapper = make_wrapper(tmp_path / 'db.sqlite3', transaction_mode='x')
+        with pytest.raises(ImproperlyConfigured):
+            wrapper.ensure_connection()
+
+    @pytest.mark.parametrize('mode,locked', [
+        ('DEFERRED', True),
+        ('IMMEDIATE', False),
+    ])
+    def test_concurrent_read_then_write(self, tmp_path, mode, locked):
+        path = tmp_path / 'db.sqlite3'
+        setup = make_wrapper(path)
+        with setup.cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value INTEGER)')
+            cursor.execute('INSERT INTO counter VALUES (0)')
+        setup.close()
+        barrier = threading.Barrier(2, timeout=1)
+
+        def read_then_write(_):
+            # Как CommentViewSet: чтение и запись в одной транзакции.
+            wrapper = make_wrapper(path, transaction_mode=mode)
+            try:
+                wrapper.ensure_connection()
+                wrapper._start_transaction_under_autocommit()
+                with wrapper.cursor() as cursor:
+                    cursor.execute('SELECT value FROM counter')
+                    value, = cursor.fetchone()
+                    # Оба потока прочитали значение до записи; в режиме
+                    # IMMEDIATE второй ждёт на BEGIN, и ожидание обрывается.
+                    try:
+                        barrier.wait()
+                    except threading.BrokenBarrierError:
+                        pass
+                    cursor.execute(
+                        'UPDATE counter SET value = %s', [value + 1]
+                    )
+                    cursor.execute('COMMIT')
+            except Exception as error:
+                return error
+            finally:
+                wrapper.close()
+            return None
+
+        with ThreadPoolExecutor(2) as pool:
+            errors = [
+                error for error in pool.map(read_then_write, range(2))
+                if error is not None
+            ]
+        assert bool(errors) is locked, (
+            f'Проверьте поведение транзакций в режиме {mode}: {errors}'
+        )
+        if not locked:
+            value, = sqlite3.connect(path).execute(
+                'SELECT value FROM counter'
+            ).fetchone()
+            assert value == 2
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from http import HTTPStatus
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostExportAPI:
+
+    export_url = '/api/v1/export/posts/'
+
+    def export(self, client, query=''):
+        response = client.get(f'{self.export_url}{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.export_url}` возвращает ответ со статусом 200.'
+        )
+        assert response.streaming, (
+            f'Проверьте, что `{self.export_url}` отдаёт ответ потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_export_not_auth(self, client):
+        response = client.get(self.export_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_export_posts_with_comments(self, user_client, post, another_post,
+                                        comment_1_post, comment_2_post,
+                                        comment_1_another_post):
+        rows = self.export(user_client)
+        assert [row['id'] for row in rows] == [post.id, another_post.id]
+        assert [comment['id'] for comment in rows[0]['comments']] == [
+            comment_1_post.id, comment_2_post.id
+        ], (
+            'Проверьте, что каждая строка выгрузки содержит комментарии '
+            'поста.'
+        )
+        assert rows[0]['author'] == post.author.username
+        assert rows[1]['comments'][0]['text'] == comment_1_another_post.text
+
+    def test_export_filters(self, user_client, post, another_post):
+        rows = self.export(
+            user_client, f'?author={another_post.author.username}'
+        )
+        assert [row['id'] for row in rows] == [another_post.id]
+
+        Post.objects.filter(id=post.id).update(
+            pub_date=timezone.now() - timedelta(days=10)
+        )
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        rows = self.export(user_client, f'?since={since}')
+        assert [row['id'] for row in rows] == [another_post.id]
+        rows = self.export(user_client, f'?until={since}')
+        assert [row['id'] for row in rows] == [post.id], (
+            'Проверьте фильтрацию выгрузки по диапазону `pub_date`.'
+        )
+
+        response = user_client.get(f'{self.export_url}?since=вчера')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_export_queries_per_chunk(self, user_client, user):
+        posts = Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=user) for number in range(6)
+        )
+        for post in Post.objects.all():
+            Comment.objects.create(author=user, post=post, text='Ок')
+        with CaptureQueriesContext(connection) as context:
+            rows = self.export(user_client)
+        assert len(rows) == len(posts)
+        assert all(len(row['comments']) == 1 for row in rows)
+        assert len(context.captured_queries) <= 2 + len(posts) // 2, (
+            'Проверьте, что выгрузка выбирает комментарии одним запросом на '
+            'порцию постов.'
+        )
@@ -0,0 +1,101 @@
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+import pytest
+
+from posts.models import Comment, Post
+
+
+TRICKY_TEXT = (
+    'Пост "в кавычках" \\ с\tтабуляцией\nи переводом строки, '
+    '\u2028разделителем\u2029 и эмодзи 🙂 ' + ''.join(map(chr, range(32)))
+)
+
+
+def make_image():
+    buffer = BytesIO()
+    Image.new('RGB', (10, 10)).save(buffer, 'PNG')
+    return SimpleUploadedFile('image.png', buffer.getvalue(), 'image/png')
+
+
+@pytest.fixture
+def posts(user, another_user, group_1, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    posts = [
+        Post.objects.create(text=TRICKY_TEXT, author=user, group=group_1),
+        Post.objects.create(
+            text='Пост с картинкой', author=another_user, image=make_image()
+        ),
+        Post.objects.create(
+            text='Пост с копиями', author=user, image=make_image(),
+            image_thumbnail=make_image(), image_webp=make_image()
+        ),
+    ]
+    Comment.objects.create(text=TRICKY_TEXT, author=user, post=posts[0])
+    Comment.objects.create(text='Ок', author=another_user, post=posts[0])
+    return posts
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr('api.renderers.orjson', None)
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFastListSerialization:
+
+    def fetch_both(self, client, settings, url):
+        settings.FAST_LIST_SERIALIZATION = False
+        regular = client.get(url)
+        settings.FAST_LIST_SERIALIZATION = True
+        fast = client.get(url)
+        assert fast.status_code == regular.status_code == 200
+        return regular.content, fast.content
+
+    @pytest.mark.parametrize('query', [
+        '', '?limit=2', '?limit=2&offset=1', '?cursor=&limit=2', '?search=пост'
+    ])
+    def test_posts_identical(self, client, settings, posts, query,
+                             json_backend):
+        regular, fast = self.fetch_both(
+            client, settings, f'/api/v1/posts/{query}'
+        )
+        assert fast == regular, (
+            'Проверьте, что быстрый список постов совпадает с обычным '
+            'ответом байт в байт.'
+        )
+
+    def test_comments_identical(self, client, settings, posts,
+                                json_backend):
+        regular, fast = self.fetch_both(
+            client, settings, f'/api/v1/posts/{posts[0].id}/comments/'
+        )
+        assert fast == regular, (
+            'Проверьте, что быстрый список комментариев совпадает с обычным '
+            'ответом байт в байт.'
+        )
+
+    def test_fast_path_used(self, client, settings, posts, monkeypatch):
+        from api.serializers import PostSerializer
+
+        settings.FAST_LIST_SERIALIZATION = True
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Использован сериализатор модели.')
+
+        monkeypatch.setattr(PostSerializer, 'to_representation', fail)
+        assert client.get('/api/v1/posts/').status_code == 200, (
+            'Проверьте, что при FAST_LIST_SERIALIZATION список строится без '
+            'PostSerializer.'
+        )
+
+    def test_browsable_api_untouched(self, client, settings, posts):
+        settings.FAST_LIST_SERIALIZATION = True
+        response = client.get('/api/v1/posts/', HTTP_ACCEPT='text/html')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/html')
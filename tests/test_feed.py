@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+from django.test import override_settings
+import pytest
+
+from posts.models import Follow, Post, TimelineEntry
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    feed_url = '/api/v1/feed/'
+
+    def feed_ids(self, client, url=None):
+        response = client.get(url or self.feed_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.feed_url}` возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()['results']]
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.feed_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.feed_url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_feed_contains_followed_posts(self, user_client, user, post,
+                                          another_post, follow_1):
+        new_post = Post.objects.create(
+            text='Новый пост', author=another_post.author
+        )
+        assert self.feed_ids(user_client) == [new_post.id, another_post.id], (
+            f'Проверьте, что `{self.feed_url}` возвращает посты авторов из '
+            'подписок пользователя от новых к старым.'
+        )
+        assert TimelineEntry.objects.filter(user=user).count() == 2, (
+            'Проверьте, что посты рассылаются в ленты подписчиков.'
+        )
+
+    def test_unfollow_clears_feed(self, user_client, user, another_post,
+                                  follow_1):
+        follow_1.delete()
+        assert self.feed_ids(user_client) == []
+        assert not TimelineEntry.objects.filter(user=user).exists()
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_popular_author_read_on_request(self, user_client, user,
+                                            another_user, follow_1):
+        post = Post.objects.create(text='Популярный пост', author=another_user)
+        assert not TimelineEntry.objects.exists(), (
+            'Проверьте, что посты популярных авторов не рассылаются по '
+            'лентам при публикации.'
+        )
+        assert self.feed_ids(user_client) == [post.id], (
+            'Проверьте, что посты популярных авторов добавляются в ленту при '
+            'чтении.'
+        )
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_timeline_merged_with_popular(self, user_client, user, user_2,
+                                          another_user, follow_1):
+        old_post = Post.objects.create(text='Старый пост', author=another_user)
+        Follow.objects.create(user=user_2, following=another_user)
+        new_post = Post.objects.create(text='Новый пост', author=another_user)
+        assert TimelineEntry.objects.filter(user=user).count() == 1
+        ids = []
+        url = f'{self.feed_url}?limit=1'
+        while url:
+            data = user_client.get(url).json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert ids == [new_post.id, old_post.id], (
+            'Проверьте, что лента по курсору объединяет записи ленты и посты '
+            'автора, ставшего популярным, без повторов.'
+        )
+        previous = user_client.get(data['previous']).json()
+        assert [item['id'] for item in previous['results']] == [new_post.id]
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_unfollow_below_limit_keeps_posts(self, user_client, user,
+                                              user_2, another_user,
+                                              follow_1):
+        follow = Follow.objects.create(user=user_2, following=another_user)
+        post = Post.objects.create(text='Популярный пост', author=another_user)
+        assert self.feed_ids(user_client) == [post.id]
+        follow.delete()
+        assert self.feed_ids(user_client) == [post.id], (
+            'Проверьте, что посты, опубликованные, пока у автора было '
+            'больше `FEED_FANOUT_LIMIT` подписчиков, остаются в ленте после '
+            'отписок ниже порога.'
+        )
+
+    def test_feed_cursor_pages(self, user_client, user, another_user,
+                               follow_1):
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=another_user)
+            for number in range(5)
+        ]
+        ids = []
+        url = f'{self.feed_url}?limit=2'
+        while url:
+            data = user_client.get(url).json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert ids == [post.id for post in reversed(posts)], (
+            'Проверьте, что лента постранично отдаёт все посты по курсору.'
+        )
+
+    def test_follow_via_api_backfills(self, user_client, user, another_post):
+        response = user_client.post(
+            '/api/v1/follow/', data={'following': another_post.author.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert Follow.objects.filter(user=user).exists()
+        assert self.feed_ids(user_client) == [another_post.id]
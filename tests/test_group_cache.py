@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from api.cache import group_cache
+from posts.models import Group
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupCache:
+
+    group_list_url = '/api/v1/groups/'
+    group_detail_url = '/api/v1/groups/{group_id}/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        queries = [query['sql'] for query in context.captured_queries]
+        return response, queries
+
+    def test_list_served_from_cache(self, client, group_1, group_2):
+        response, _ = self.get(client, self.group_list_url)
+        assert response['X-Cache'] == 'MISS'
+        cached, queries = self.get(client, self.group_list_url)
+        assert cached['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.group_list_url}` '
+            'отдаётся из кэша.'
+        )
+        assert cached.json() == response.json()
+        assert not any('posts_group' in sql for sql in queries), (
+            'Проверьте, что ответ из кэша не обращается к таблице групп.'
+        )
+
+    def test_invalidated_on_save_and_delete(self, client, group_1):
+        self.get(client, self.group_list_url)
+        group_1.title = 'Новое название'
+        group_1.save()
+        response, _ = self.get(client, self.group_list_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()[0]['title'] == 'Новое название', (
+            'Проверьте, что изменение группы сбрасывает кэш ответов.'
+        )
+        group_1.delete()
+        response, _ = self.get(client, self.group_list_url)
+        assert response.json() == []
+
+    def test_invalidated_after_commit(self, group_1):
+        version = group_cache.get_version()
+        with transaction.atomic():
+            group_1.title = 'Новое название'
+            group_1.save()
+            assert group_cache.get_version() == version, (
+                'Проверьте, что кэш групп сбрасывается только после '
+                'фиксации транзакции.'
+            )
+        assert group_cache.get_version() == version + 1
+
+    def test_detail_cached(self, client, group_1, group_2):
+        url = self.group_detail_url.format(group_id=group_1.id)
+        self.get(client, url)
+        response, _ = self.get(client, url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.json()['slug'] == group_1.slug
+        other, _ = self.get(
+            client, self.group_detail_url.format(group_id=group_2.id)
+        )
+        assert other.json()['slug'] == group_2.slug
+
+    def test_missing_group_not_cached(self, client):
+        for _ in range(2):
+            response = client.get(self.group_detail_url.format(group_id=999))
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        Group.objects.create(id=999, title='Группа', slug='late')
+        response = client.get(self.group_detail_url.format(group_id=999))
+        assert response.status_code == HTTPStatus.OK
+
+    def test_stats(self, client, group_1):
+        for _ in range(3):
+            self.get(client, self.group_list_url)
+        assert group_cache.stats() == {'hits': 2, 'misses': 1}, (
+            'Проверьте, что кэш групп считает попадания и промахи.'
+        )
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверка плана запроса написана для EXPLAIN QUERY PLAN SQLite.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIndexUsage:
+
+    def main_query_plan(self, client, url, table):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']
+            and 'COUNT(*)' not in query['sql']
+        ]
+        assert queries, f'Не найден запрос к таблице `{table}` для `{url}`.'
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {queries[-1]}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_index_used(self, client, url, table):
+        plan = self.main_query_plan(client, url, table)
+        table_steps = [step for step in plan if f' {table}' in step]
+        assert table_steps and all(
+            'USING' in step for step in table_steps
+        ), (
+            f'Проверьте, что основной запрос `{url}` читает таблицу '
+            f'`{table}` по индексу, а не полным просмотром: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Проверьте, что сортировка в запросе `{url}` берётся из '
+            f'индекса: {plan}'
+        )
+
+    def test_posts_list(self, client, post, another_post):
+        for url in ('/api/v1/posts/', '/api/v1/posts/?limit=1&offset=1',
+                    '/api/v1/posts/?cursor=&limit=1'):
+            self.assert_index_used(client, url, 'posts_post')
+
+    def test_comments_list(self, client, post, comment_1_post,
+                           comment_1_another_post):
+        self.assert_index_used(
+            client, f'/api/v1/posts/{post.id}/comments/', 'posts_comment'
+        )
+
+    def test_follow_list(self, user_client, follow_1, follow_5):
+        self.assert_index_used(user_client, '/api/v1/follow/', 'posts_follow')
+
+    def test_feed_timeline(self, user_client, follow_1, another_post):
+        self.assert_index_used(
+            user_client, '/api/v1/feed/', 'posts_timelineentry'
+        )
+        plan = self.main_query_plan(
+            user_client, '/api/v1/feed/', 'posts_post'
+        )
+        steps = [
+            step for step in plan if step.startswith(('SCAN', 'SEARCH'))
+        ]
+        assert steps and all('USING' in step for step in steps), (
+            'Проверьте, что лента читает ленту пользователя, подписки и '
+            f'посты по индексам: {plan}'
+        )
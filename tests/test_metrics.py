@@ -0,0 +1,137 @@
+import json
+import re
+
+import pytest
+
+from api.metrics import registry
+from api.throttling import SlidingWindowAnonRateThrottle
+
+
+def parse_metrics(text):
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        name, value = line.rsplit(' ', 1)
+        samples[name] = float(value)
+    return samples
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(registry, 'directory', None)
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMetricsEndpoint:
+
+    url = '/metrics'
+
+    def scrape(self, client):
+        response = client.get(self.url)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{self.url}` возвращает ответ со статусом 200.'
+        )
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что метрики отдаются в текстовом формате Prometheus.'
+        )
+        return parse_metrics(response.content.decode())
+
+    def test_route_counters(self, client, post):
+        for _ in range(3):
+            client.get('/api/v1/posts/')
+        client.get(f'/api/v1/posts/{post.id}/comments/')
+        samples = self.scrape(client)
+        assert samples[
+            'yatube_http_requests_total'
+            '{method="GET",route="posts-list",status="200"}'
+        ] == 3, 'Проверьте, что запросы учитываются по имени маршрута.'
+        assert samples[
+            'yatube_http_requests_total'
+            '{method="GET",route="comments-list",status="200"}'
+        ] == 1
+
+    def test_histograms(self, client, post):
+        client.get('/api/v1/posts/')
+        samples = self.scrape(client)
+        assert samples[
+            'yatube_http_request_duration_seconds_bucket'
+            '{method="GET",route="posts-list",le="+Inf"}'
+        ] == 1, 'Проверьте, что время запросов учитывается в гистограмме.'
+        assert samples[
+            'yatube_db_queries_per_request_count{route="posts-list"}'
+        ] == 1
+        assert samples[
+            'yatube_db_queries_per_request_sum{route="posts-list"}'
+        ] >= 1, 'Проверьте, что учитывается число SQL-запросов.'
+        buckets = [
+            value for name, value in samples.items()
+            if name.startswith('yatube_db_queries_per_request_bucket')
+        ]
+        assert buckets == sorted(buckets), (
+            'Проверьте, что значения корзин гистограммы накопительные.'
+        )
+
+    def test_throttle_rejections(self, client, monkeypatch):
+        monkeypatch.setattr(
+            SlidingWindowAnonRateThrottle, 'THROTTLE_RATES', {'anon': '1/min'}
+        )
+        for _ in range(3):
+            client.get('/api/v1/posts/')
+        samples = self.scrape(client)
+        assert samples[
+            'yatube_throttle_rejections_total{scope="anon"}'
+        ] == 2, 'Проверьте, что учитываются отклонённые запросы.'
+
+    def test_cache_hit_ratio(self, client, group_1):
+        for _ in range(4):
+            client.get('/api/v1/groups/')
+        samples = self.scrape(client)
+        assert samples[
+            'yatube_cache_requests_total{cache="groups",result="hit"}'
+        ] == 3
+        assert samples['yatube_cache_hit_ratio{cache="groups"}'] == 0.75, (
+            'Проверьте, что метрики содержат долю попаданий в кэш.'
+        )
+
+
+def test_processes_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, 'directory', tmp_path)
+    registry.inc('http_requests_total', route='posts-list', method='GET',
+                 status=200)
+    registry.observe('db_queries_per_request', 3, route='posts-list')
+    other = {
+        'http_requests_total': [
+            [{'route': 'posts-list', 'method': 'GET', 'status': 200}, 4],
+        ],
+        'db_queries_per_request': [
+            [{'route': 'posts-list'}, [[0, 1, 0, 0, 0, 0, 0, 0, 0], 2, 1]],
+        ],
+    }
+    (tmp_path / '1.json').write_text(json.dumps(other))
+    samples = parse_metrics(registry.render())
+    assert samples[
+        'yatube_http_requests_total'
+        '{method="GET",route="posts-list",status="200"}'
+    ] == 5, 'Проверьте, что метрики всех рабочих процессов суммируются.'
+    assert samples[
+        'yatube_db_queries_per_request_bucket{route="posts-list",le="3"}'
+    ] == 2
+    assert samples[
+        'yatube_db_queries_per_request_sum{route="posts-list"}'
+    ] == 5
+    assert any(
+        re.fullmatch(r'\d+\.json', path.name) for path in tmp_path.iterdir()
+        if path.name != '1.json'
+    ), 'Проверьте, что процесс записывает свои метрики в общий каталог.'
+
+
+def test_reset_after_fork(monkeypatch):
+    registry.inc('throttle_rejections_total', scope='anon')
+    monkeypatch.setattr(registry, 'pid', -1)
+    assert registry.snapshot()['throttle_rejections_total'] == [], (
+        'Проверьте, что процесс после fork не наследует метрики родителя.'
+    )
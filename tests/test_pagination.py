@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Group, Post
+
+
+MAX_LIMIT = 2
+
+
+@pytest.fixture
+def max_limit(settings):
+    settings.PAGINATION_MAX_LIMIT = MAX_LIMIT
+    return MAX_LIMIT
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBoundedPagination:
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response
+
+    def test_unwrapped_list_is_capped(self, client, max_limit, post, user):
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {number}', author=user, post=post)
+            for number in range(max_limit + 1)
+        )
+        url = f'/api/v1/posts/{post.id}/comments/'
+        response = self.get(client, url)
+        data = response.json()
+        assert isinstance(data, list) and len(data) == max_limit, (
+            f'Проверьте, что GET-запрос к `{url}` без параметра `limit` '
+            'возвращает список не длиннее PAGINATION_MAX_LIMIT.'
+        )
+        assert f'limit={max_limit}' in response['Link'], (
+            'Проверьте, что адрес продолжения списка передаётся в '
+            'заголовке Link.'
+        )
+        next_url = response['Link'][1:response['Link'].index('>')]
+        rest = self.get(client, next_url).json()
+        assert [item['id'] for item in data + rest['results']] == list(
+            post.comments.order_by('created', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        assert rest['next'] is None
+
+    def test_short_list_has_no_link(self, client, max_limit, post, post_2):
+        response = self.get(client, '/api/v1/posts/')
+        assert len(response.json()) == 2
+        assert 'Link' not in response
+
+    @pytest.mark.parametrize('limit', ['1000000', 'abc', '0'])
+    def test_limit_ceiling(self, client, max_limit, user, limit):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=user)
+            for number in range(max_limit + 1)
+        )
+        data = self.get(client, f'/api/v1/posts/?limit={limit}').json()
+        assert data['count'] == max_limit + 1
+        assert len(data['results']) == max_limit, (
+            'Проверьте, что параметр `limit` не может превысить '
+            'PAGINATION_MAX_LIMIT.'
+        )
+
+    def test_cursor_ceiling(self, client, max_limit, user):
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=user)
+            for number in range(max_limit + 1)
+        )
+        data = self.get(client, '/api/v1/posts/?cursor=&limit=1000').json()
+        assert len(data['results']) == max_limit
+
+    def test_follow_list(self, user_client, max_limit, follow_1, follow_2,
+                         user, django_user_model):
+        for number in range(max_limit):
+            user.follower.create(following=django_user_model.objects.create(
+                username=f'author_{number}', password='!'
+            ))
+        response = self.get(user_client, '/api/v1/follow/')
+        assert len(response.json()) == max_limit and 'Link' in response
+        data = self.get(user_client, '/api/v1/follow/?limit=100').json()
+        assert data['count'] == user.follower.count()
+
+    def test_group_list_cached_with_link(self, client, max_limit):
+        Group.objects.bulk_create(
+            Group(title=f'Группа {number}', slug=f'group_{number}')
+            for number in range(max_limit + 1)
+        )
+        response = self.get(client, '/api/v1/groups/')
+        cached = self.get(client, '/api/v1/groups/')
+        assert cached['X-Cache'] == 'HIT'
+        assert cached.json() == response.json()
+        assert len(cached.json()) == max_limit
+        assert cached['Link'] == response['Link'], (
+            'Проверьте, что ответ из кэша сохраняет заголовок Link.'
+        )
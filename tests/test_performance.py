@@ -0,0 +1,375 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import time
+from types import ModuleType
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+import pytest
+
+from api.async_views import async_read_urls
+from api.urls import router_v1
+from tests.fixtures.fixture_perf import (
+    COMMENTS, load_metrics, measure, measure_rss, perf_only, scaled
+)
+
+
+pytestmark = [perf_only, pytest.mark.django_db]
+
+ROUTE_NAMES = sorted({
+    pattern.name for pattern in router_v1.urls
+    if 'format' not in pattern.pattern.regex.groupindex
+    and 'get' in getattr(pattern.callback, 'actions', {'get': 'get'})
+})
+BULK_POSTS = 200
+LOAD_REQUESTS = 300
+LOAD_CONCURRENCY = 30
+UPLOAD_SIZES_MB = (1, 4, 8)
+THROTTLE_REQUESTS = 5000
+WRITERS = 8
+WRITES_PER_WRITER = 25
+
+
+def route_kwargs(perf_data):
+    post = perf_data['post']
+    return {
+        'posts': {'pk': post.id},
+        'comments': {'post_id': post.id, 'pk': perf_data['comment'].id},
+        'groups': {'pk': perf_data['groups'][0].id},
+        'group-posts': {'slug': perf_data['groups'][0].slug},
+        'users': {'username': perf_data['user'].username},
+    }
+
+
+@pytest.mark.parametrize('route_name', ROUTE_NAMES)
+def test_route_budget(route_name, perf_data, perf_client, perf_baseline):
+    from django.urls import reverse
+
+    pattern = next(
+        pattern for pattern in router_v1.urls if pattern.name == route_name
+    )
+    basename = route_name.rsplit('-', 1)[0]
+    samples = route_kwargs(perf_data).get(basename, {})
+    kwargs = {
+        name: samples[name] for name in pattern.pattern.regex.groupindex
+    }
+    url = reverse(route_name, kwargs=kwargs)
+
+    metrics = measure(lambda: perf_client.get(url))
+    regressions = perf_baseline.check(f'GET {route_name}', metrics)
+    assert not regressions, (
+        'Производительность эндпоинта ухудшилась относительно базового '
+        'замера: ' + '; '.join(regressions)
+    )
+
+
+def test_bulk_create_throughput(perf_client, perf_baseline):
+    data = [{'text': f'Пакетный пост {number}'} for number in range(BULK_POSTS)]
+
+    def single():
+        for item in data:
+            perf_client.post('/api/v1/posts/', data=item, format='json')
+
+    def bulk():
+        perf_client.post('/api/v1/posts/bulk/', data=data, format='json')
+
+    single_metrics = measure(single, repeats=1)
+    bulk_metrics = measure(bulk, repeats=1)
+    regressions = (
+        perf_baseline.check(f'POST posts-list x{BULK_POSTS}', single_metrics)
+        + perf_baseline.check(f'POST posts-bulk x{BULK_POSTS}', bulk_metrics)
+    )
+    assert bulk_metrics['time_ms'] < single_metrics['time_ms'], (
+        'Проверьте, что создание постов списком быстрее создания по одному.'
+    )
+    assert not regressions, '; '.join(regressions)
+
+
+def test_export_memory_constant(perf_data, perf_client, perf_baseline):
+    from posts.models import Post
+
+    pub_dates = Post.objects.order_by('id').values_list('pub_date', flat=True)
+    middle = pub_dates[pub_dates.count() // 2]
+
+    def export(query=''):
+        response = perf_client.get(f'/api/v1/export/posts/{query}')
+        for _ in response.streaming_content:
+            pass
+
+    half = measure(
+        lambda: export(f'?until={middle.isoformat().replace("+", "%2B")}'),
+        repeats=0
+    )
+    full = measure(export, repeats=0)
+    regressions = perf_baseline.check('GET posts-export', full)
+    assert full['peak_kb'] < half['peak_kb'] * 1.5, (
+        'Проверьте, что память выгрузки не растёт с числом постов: '
+        f'половина таблицы {half["peak_kb"]} КБ, вся {full["peak_kb"]} КБ.'
+    )
+    assert not regressions, '; '.join(regressions)
+
+
+def run_wsgi_load(url):
+    def request(_):
+        start = time.perf_counter()
+        Client().get(url)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(LOAD_CONCURRENCY) as pool:
+        latencies = list(pool.map(request, range(LOAD_REQUESTS)))
+    return load_metrics(latencies, time.perf_counter() - start)
+
+
+def run_asgi_load(url, route_names):
+    urlconf = ModuleType('load_urls')
+    urlconf.urlpatterns = [
+        path('api/v1/', include(async_read_urls(router_v1.urls,
+                                                route_names))),
+    ]
+
+    async def load():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(LOAD_CONCURRENCY)
+
+        async def request():
+            async with semaphore:
+                start = time.perf_counter()
+                await client.get(url)
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(
+            *(request() for _ in range(LOAD_REQUESTS))
+        )
+        return load_metrics(latencies, time.perf_counter() - start)
+
+    with override_settings(ROOT_URLCONF=urlconf):
+        return async_to_sync(load)()
+
+
+def test_async_read_load(perf_data, perf_baseline):
+    url = '/api/v1/posts/?limit=20&offset=100'
+    results = {}
+    for name, run in (
+        ('WSGI', lambda: run_wsgi_load(url)),
+        ('ASGI sync', lambda: run_asgi_load(url, ())),
+        ('ASGI async', lambda: run_asgi_load(url, ('posts-list',))),
+    ):
+        cache.clear()
+        results[name] = run()
+    regressions = []
+    for name, metrics in results.items():
+        regressions += perf_baseline.check(f'LOAD posts-list {name}', metrics)
+    assert not regressions, '; '.join(regressions)
+
+
+def noise_png(size_mb):
+    from io import BytesIO
+
+    from PIL import Image
+
+    side = int((size_mb * 1024 * 1024 / 3) ** 0.5)
+    buffer = BytesIO()
+    Image.frombytes('RGB', (side, side), os.urandom(side * side * 3)).save(
+        buffer, 'PNG', compress_level=0
+    )
+    buffer.name = f'noise_{size_mb}.png'
+    buffer.seek(0)
+    return buffer
+
+
+def test_upload_peak_rss(perf_data, perf_baseline, settings, tmp_path,
+                         monkeypatch):
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from api.views import PostViewSet
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    monkeypatch.setattr('api.views.schedule_variants', lambda post: None)
+    view = PostViewSet.as_view({'post': 'create'})
+    results = {}
+    for size_mb in UPLOAD_SIZES_MB:
+        request = APIRequestFactory().post(
+            '/api/v1/posts/',
+            data={'text': 'Пост', 'image': noise_png(size_mb)},
+            format='multipart'
+        )
+        force_authenticate(request, user=perf_data['user'])
+        responses = []
+        results[size_mb] = measure_rss(
+            lambda: responses.append(view(request))
+        )
+        request.close()
+        assert responses[0].status_code == 201
+    regressions = []
+    for size_mb, metrics in results.items():
+        regressions += perf_baseline.check(
+            f'POST posts-list image {size_mb} MB', metrics
+        )
+    largest = results[UPLOAD_SIZES_MB[-1]]['rss_peak_kb']
+    assert largest < UPLOAD_SIZES_MB[-1] * 1024 / 2, (
+        'Проверьте, что загрузка изображения пишется на диск по частям и не '
+        f'декодирует растр: пик памяти {largest} КБ.'
+    )
+    assert not regressions, '; '.join(regressions)
+
+
+def test_throttle_overhead(perf_baseline, tmp_path, monkeypatch):
+    from django.contrib.auth.models import AnonymousUser
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.throttling import AnonRateThrottle
+
+    from api.throttling import (
+        CacheThrottleStorage,
+        SlidingWindowAnonRateThrottle,
+        SQLiteThrottleStorage
+    )
+
+    request = APIRequestFactory().get('/api/v1/posts/')
+    request.user = AnonymousUser()
+    rates = {'anon': f'{THROTTLE_REQUESTS * 10}/day'}
+
+    def run(throttle_class):
+        monkeypatch.setattr(throttle_class, 'THROTTLE_RATES', rates)
+        start = time.perf_counter()
+        for _ in range(THROTTLE_REQUESTS):
+            assert throttle_class().allow_request(request, None)
+        return {
+            'us_per_request': round(
+                (time.perf_counter() - start) / THROTTLE_REQUESTS * 1e6, 1
+            ),
+        }
+
+    results = {}
+    cache.clear()
+    results['DRF history'] = run(AnonRateThrottle)
+    for name, storage in (
+        ('cache', CacheThrottleStorage()),
+        ('sqlite', SQLiteThrottleStorage(tmp_path / 'throttle.sqlite3')),
+    ):
+        cache.clear()
+        monkeypatch.setattr(
+            'api.throttling.get_throttle_storage', lambda: storage
+        )
+        results[f'sliding {name}'] = run(SlidingWindowAnonRateThrottle)
+    regressions = []
+    for name, metrics in results.items():
+        regressions += perf_baseline.check(f'THROTTLE {name}', metrics)
+    assert not regressions, '; '.join(regressions)
+
+
+@pytest.mark.parametrize('basename', ['posts', 'comments'])
+def test_fast_list_serialization(basename, perf_data, perf_client,
+                                 perf_baseline, settings):
+    url = {
+        'posts': '/api/v1/posts/?limit=100&offset=0',
+        'comments': f'/api/v1/posts/{perf_data["post"].id}/comments/',
+    }[basename]
+
+    def get():
+        assert perf_client.get(url).status_code == 200
+
+    settings.FAST_LIST_SERIALIZATION = False
+    regular = measure(get)
+    settings.FAST_LIST_SERIALIZATION = True
+    fast = measure(get)
+    regressions = perf_baseline.check(f'GET {basename}-list fast', fast)
+    assert fast['time_ms'] < regular['time_ms'], (
+        'Проверьте, что быстрый список быстрее сериализации DRF.'
+    )
+    assert not regressions, '; '.join(regressions)
+
+
+def test_viral_post_comments_bounded(viral_post, perf_client, perf_baseline,
+                                     settings):
+    base = f'/api/v1/posts/{viral_post.id}/comments/'
+    limit = settings.PAGINATION_MAX_LIMIT
+    urls = {
+        'unwrapped': base,
+        'first page': f'{base}?limit={limit}&offset=0',
+        'last page': f'{base}?limit={limit}&offset={scaled(COMMENTS) - limit}',
+        'over limit': f'{base}?limit={scaled(COMMENTS)}',
+    }
+    results = {}
+    for name, url in urls.items():
+        responses = []
+
+        def get():
+            responses.append(perf_client.get(url))
+
+        results[name] = measure(get)
+        data = responses[-1].json()
+        rows = data if isinstance(data, list) else data['results']
+        assert len(rows) == min(limit, scaled(COMMENTS)), (
+            f'Проверьте, что `{url}` возвращает не больше {limit} записей.'
+        )
+    regressions = []
+    for name, metrics in results.items():
+        regressions += perf_baseline.check(
+            f'GET comments-list viral {name}', metrics
+        )
+    first = results['first page']['peak_kb']
+    for name, metrics in results.items():
+        assert metrics['peak_kb'] < first * 1.5 + 256, (
+            f'Проверьте, что память ответа `{name}` не зависит от числа '
+            f'комментариев: {metrics["peak_kb"]} КБ против {first} КБ.'
+        )
+    assert not regressions, '; '.join(regressions)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_contention(perf_data, perf_baseline):
+    # Тест очищает базу после себя, поэтому стоит последним в модуле.
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from posts.models import Comment
+
+    post = perf_data['post']
+    post.refresh_from_db()
+    comments_before = Comment.objects.filter(post=post).count()
+    counter_before = post.comments_count
+
+    def write(user):
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        latencies, statuses = [], []
+        try:
+            for number in range(WRITES_PER_WRITER):
+                url, data = (
+                    (f'/api/v1/posts/{post.id}/comments/', {'text': 'Ок'})
+                    if number % 2 else ('/api/v1/posts/', {'text': 'Пост'})
+                )
+                start = time.perf_counter()
+                statuses.append(client.post(url, data=data).status_code)
+                latencies.append(time.perf_counter() - start)
+        finally:
+            connections.close_all()
+        return latencies, statuses
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WRITERS) as pool:
+        results = list(pool.map(write, perf_data['users'][1:WRITERS + 1]))
+    elapsed = time.perf_counter() - start
+    latencies = [value for result, _ in results for value in result]
+    statuses = [value for _, result in results for value in result]
+    metrics = load_metrics(latencies, elapsed)
+    failed = [status for status in statuses if status != 201]
+    assert not failed, (
+        'Проверьте, что конкурентные записи не получают ошибку '
+        f'`database is locked`: статусы {sorted(set(failed))}.'
+    )
+    comments = WRITERS * (WRITES_PER_WRITER // 2)
+    assert Comment.objects.filter(post=post).count() == (
+        comments_before + comments
+    )
+    post.refresh_from_db()
+    assert post.comments_count == counter_before + comments
+    regressions = perf_baseline.check('POST write contention', metrics)
+    assert not regressions, '; '.join(regressions)
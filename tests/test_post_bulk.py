@@ -0,0 +1,119 @@
+from http import HTTPStatus
+import json
+
+from django.test import override_settings
+import pytest
+
+from posts.models import Post, TimelineEntry
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostBulkAPI:
+
+    bulk_url = '/api/v1/posts/bulk/'
+
+    def test_bulk_not_auth(self, client):
+        response = client.post(
+            self.bulk_url,
+            data=json.dumps([{'text': 'Пост'}]),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что POST-запрос неавторизованного пользователя к '
+            f'`{self.bulk_url}` возвращает ответ со статусом 401.'
+        )
+
+    @override_settings(BULK_POSTS_CHUNK_SIZE=2)
+    def test_bulk_json(self, user_client, user, group_1):
+        data = [
+            {'text': f'Пост {number}', 'group': group_1.id}
+            for number in range(5)
+        ]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос со списком постов к `{self.bulk_url}` '
+            'возвращает ответ со статусом 201.'
+        )
+        results = response.json()
+        assert len(results) == 5
+        for item, sent in zip(results, data):
+            post = Post.objects.get(id=item['id'])
+            assert post.text == sent['text'] == item['text'], (
+                'Проверьте, что ответ содержит созданные посты в порядке '
+                'запроса с корректными `id`.'
+            )
+            assert post.author == user and post.group == group_1
+            assert item['author'] == user.username
+
+    def test_bulk_ndjson(self, user_client):
+        body = '\n'.join(
+            json.dumps({'text': f'Пост {number}'}) for number in range(3)
+        )
+        response = user_client.post(
+            self.bulk_url, data=body, content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что `{self.bulk_url}` принимает посты в формате '
+            'NDJSON.'
+        )
+        assert Post.objects.count() == 3
+
+    def test_bulk_invalid_item(self, user_client):
+        data = [{'text': 'Пост'}, {}, {'text': 'Ещё пост'}]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and not errors[0] and 'text' in errors[1], (
+            'Проверьте, что ошибки валидации возвращаются для каждого '
+            'элемента списка.'
+        )
+        assert not Post.objects.exists()
+
+    @override_settings(BULK_POSTS_MAX=2)
+    def test_bulk_limits(self, user_client):
+        response = user_client.post(
+            self.bulk_url, data={'text': 'Пост'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.post(
+            self.bulk_url, data=[{'text': 'Пост'}] * 3, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Post.objects.exists()
+
+    @override_settings(BULK_POSTS_MAX=2)
+    def test_bulk_ndjson_limit(self, user_client):
+        lines = [json.dumps({'text': 'Пост'})] * 3 + ['не JSON']
+        response = user_client.post(
+            self.bulk_url, data='\n'.join(lines),
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'максимум 2' in response.json()['detail'], (
+            'Проверьте, что разбор NDJSON прекращается сразу после '
+            'превышения `BULK_POSTS_MAX`, не дочитывая тело запроса.'
+        )
+        assert not Post.objects.exists()
+
+    def test_bulk_ndjson_invalid_encoding(self, user_client):
+        response = user_client.post(
+            self.bulk_url, data=b'{"text": "\xff"}\n',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что строка NDJSON в неверной кодировке приводит к '
+            'ответу со статусом 400.'
+        )
+        assert not Post.objects.exists()
+
+    def test_bulk_fan_out(self, user_client, user, follow_4, another_user):
+        response = user_client.post(
+            self.bulk_url, data=[{'text': 'Пост'}], format='json'
+        )
+        post_id = response.json()[0]['id']
+        assert TimelineEntry.objects.filter(
+            user=another_user, post_id=post_id
+        ).exists(), (
+            'Проверьте, что посты, созданные списком, попадают в ленты '
+            'подписчиков.'
+        )
@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostCursorAPI:
+
+    post_list_url = '/api/v1/posts/'
+
+    def create_posts(self, user, count):
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=user)
+            for number in range(count)
+        ]
+        return [post.id for post in posts]
+
+    def collect_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что GET-запрос с параметром `cursor` к '
+                f'`{self.post_list_url}` возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_cursor_first_page(self, client, user):
+        post_ids = self.create_posts(user, 3)
+        response = client.get(f'{self.post_list_url}?cursor=&limit=2')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос с пустым параметром `cursor` к '
+            f'`{self.post_list_url}` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        for field in ('next', 'previous', 'results'):
+            assert field in data, (
+                'Проверьте, что в режиме курсорной пагинации ответ '
+                f'содержит поле `{field}`.'
+            )
+        assert [item['id'] for item in data['results']] == post_ids[:2], (
+            'Проверьте, что курсорная пагинация упорядочивает посты по '
+            '`pub_date` и `id`.'
+        )
+        assert data['previous'] is None
+        assert data['next'] is not None
+
+    def test_cursor_walks_all_posts(self, client, user):
+        post_ids = self.create_posts(user, 7)
+        Post.objects.filter(id__in=post_ids[2:5]).update(
+            pub_date=Post.objects.get(id=post_ids[2]).pub_date
+        )
+        ids = self.collect_pages(
+            client, f'{self.post_list_url}?cursor=&limit=2'
+        )
+        assert ids == post_ids, (
+            'Проверьте, что переход по ссылкам `next` возвращает все посты '
+            'ровно один раз, в том числе при совпадающей `pub_date`.'
+        )
+
+    def test_cursor_previous_link(self, client, user):
+        post_ids = self.create_posts(user, 5)
+        first = client.get(f'{self.post_list_url}?cursor=&limit=2').json()
+        second = client.get(first['next']).json()
+        assert [item['id'] for item in second['results']] == post_ids[2:4]
+        previous = client.get(second['previous']).json()
+        assert [item['id'] for item in previous['results']] == post_ids[:2], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу.'
+        )
+
+    def test_invalid_cursor(self, client, user):
+        self.create_posts(user, 1)
+        response = client.get(f'{self.post_list_url}?cursor=cD14fDE%3D')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что некорректный курсор возвращает ответ со '
+            'статусом 404.'
+        )
+
+    def test_limit_offset_kept(self, client, user):
+        self.create_posts(user, 3)
+        response = client.get(f'{self.post_list_url}?limit=2&offset=1')
+        data = response.json()
+        assert data['count'] == 3 and len(data['results']) == 2, (
+            'Проверьте, что параметры `limit` и `offset` продолжают работать '
+            'без параметра `cursor`.'
+        )
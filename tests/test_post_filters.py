@@ -0,0 +1,164 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import pytest
+
+from posts.models import Post
+
+
+@pytest.fixture
+def posts(user, another_user, group_1, group_2):
+    now = timezone.now()
+    specs = [
+        (user, group_1, 3), (user, group_2, 2),
+        (another_user, group_1, 1), (another_user, None, 0),
+    ]
+    posts = []
+    for author, group, days_ago in specs:
+        post = Post.objects.create(text='Пост', author=author, group=group)
+        Post.objects.filter(id=post.id).update(
+            pub_date=now - timedelta(days=days_ago)
+        )
+        posts.append(post)
+    return posts
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostFilters:
+
+    url = '/api/v1/posts/'
+
+    def get_ids(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [item['id'] for item in response.json()]
+
+    def test_group_by_id_and_slug(self, client, posts, group_1):
+        expected = [posts[0].id, posts[2].id]
+        assert self.get_ids(
+            client, f'{self.url}?group={group_1.id}'
+        ) == expected, 'Проверьте фильтрацию постов по id группы.'
+        assert self.get_ids(
+            client, f'{self.url}?group={group_1.slug}'
+        ) == expected, 'Проверьте фильтрацию постов по slug группы.'
+
+    def test_group_numeric_slug(self, client, posts, group_1, group_2):
+        group_2.slug = str(group_1.id)
+        group_2.save()
+        assert sorted(self.get_ids(
+            client, f'{self.url}?group={group_1.id}'
+        )) == sorted(post.id for post in posts[:3]), (
+            'Проверьте, что числовое значение `group` ищет группу и по id, '
+            'и по slug.'
+        )
+
+    def test_author(self, client, posts, another_user):
+        assert self.get_ids(
+            client, f'{self.url}?author={another_user.username}'
+        ) == [posts[2].id, posts[3].id], (
+            'Проверьте фильтрацию постов по имени автора.'
+        )
+
+    def test_pub_date_range(self, client, posts):
+        since = (timezone.now() - timedelta(days=2, hours=1)).date()
+        until = timezone.now().date()
+        assert self.get_ids(
+            client, f'{self.url}?since={since}&until={until}'
+        ) == [posts[1].id, posts[2].id], (
+            'Проверьте фильтрацию постов по интервалу дат публикации.'
+        )
+
+    def test_combined(self, client, posts, user, group_1):
+        assert self.get_ids(
+            client, f'{self.url}?author={user.username}&group={group_1.slug}'
+        ) == [posts[0].id]
+
+    def test_invalid_date(self, client, posts):
+        response = client.get(f'{self.url}?since=вчера')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректная дата возвращает ответ со статусом '
+            '400.'
+        )
+
+    def test_group_posts_route(self, client, posts, group_1):
+        assert self.get_ids(
+            client, f'/api/v1/groups/{group_1.slug}/posts/'
+        ) == [posts[0].id, posts[2].id], (
+            'Проверьте, что `/api/v1/groups/{slug}/posts/` возвращает посты '
+            'группы.'
+        )
+        response = client.get('/api/v1/groups/no_such_group/posts/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(
+            f'/api/v1/groups/{group_1.slug}/posts/{posts[0].id}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что у постов группы нет адреса отдельной записи.'
+        )
+
+    def test_group_posts_paginated(self, client, posts, group_1):
+        response = client.get(
+            f'/api/v1/groups/{group_1.slug}/posts/?limit=1&offset=1'
+        )
+        data = response.json()
+        assert data['count'] == 2 and [
+            item['id'] for item in data['results']
+        ] == [posts[2].id]
+
+
+FILTER_CASES = [
+    ('/api/v1/posts/?group={group_id}', 2),
+    ('/api/v1/posts/?group={group_slug}', 2),
+    ('/api/v1/posts/?author={username}', 2),
+    ('/api/v1/posts/?since={since}', 2),
+    ('/api/v1/posts/?since={since}&until={until}', 2),
+    ('/api/v1/posts/?author={username}&group={group_slug}', 2),
+    ('/api/v1/posts/?group={group_id}&since={since}', 2),
+    ('/api/v1/posts/?group={group_id}&limit=10&offset=0', 3),
+    ('/api/v1/posts/?author={username}&cursor=&limit=10', 2),
+    ('/api/v1/groups/{group_slug}/posts/', 3),
+    ('/api/v1/groups/{group_slug}/posts/?author={username}', 3),
+]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверка плана запроса написана для EXPLAIN QUERY PLAN SQLite.'
+)
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('template,expected_queries', FILTER_CASES)
+def test_filter_uses_index(client, posts, user, group_1, template,
+                           expected_queries):
+    url = template.format(
+        group_id=group_1.id, group_slug=group_1.slug, username=user.username,
+        since=(timezone.now() - timedelta(days=5)).date(),
+        until=timezone.now().date()
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(context.captured_queries) == expected_queries, (
+        f'Проверьте, что запрос `{url}` выполняет {expected_queries} '
+        f'SQL-запрос(а), выполнено {len(context.captured_queries)}.'
+    )
+    query = [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "posts_post"' in query['sql']
+        and 'COUNT(*)' not in query['sql']
+    ][-1]
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {query}')
+        plan = [row[-1] for row in cursor.fetchall()]
+    steps = [step for step in plan if step.startswith(('SCAN', 'SEARCH'))]
+    assert steps and all('USING' in step for step in steps), (
+        f'Проверьте, что запрос `{url}` читает таблицы по индексам: {plan}'
+    )
+    assert any(
+        step.startswith('SEARCH posts_post USING INDEX') for step in steps
+    ), f'Проверьте, что посты выбираются поиском по индексу: {plan}'
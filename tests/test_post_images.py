@@ -0,0 +1,218 @@
+from http import HTTPStatus
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+import pytest
+
+from posts.images import build_variants, wait_pending
+from posts.models import Post
+
+
+def make_image(name='image.png', size=(800, 600)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color=(200, 40, 40)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImageVariants:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def test_variants_built_in_background(self, user_client, media_root):
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост с картинкой', 'image': make_image()},
+            format='multipart'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        for field in ('image_thumbnail', 'image_webp'):
+            assert field in data, (
+                f'Проверьте, что ответ с данными поста содержит поле '
+                f'`{field}`.'
+            )
+
+        wait_pending(timeout=10)
+        post = Post.objects.get(id=data['id'])
+        assert post.image_thumbnail and post.image_webp, (
+            'Проверьте, что после загрузки изображения в фоне готовятся '
+            'миниатюра и копия WebP.'
+        )
+        with Image.open(post.image_thumbnail.path) as thumbnail:
+            assert max(thumbnail.size) <= 320
+        with Image.open(post.image_webp.path) as webp:
+            assert webp.format == 'WEBP' and webp.size == (800, 600)
+
+        data = user_client.get(
+            self.post_detail_url.format(post_id=post.id)
+        ).json()
+        assert data['image_thumbnail'].endswith(post.image_thumbnail.url)
+        assert data['image_webp'].endswith(post.image_webp.url)
+
+    def test_fallback_to_original(self, user_client, user, media_root):
+        post = Post.objects.create(
+            text='Пост', author=user, image=make_image()
+        )
+        data = user_client.get(
+            self.post_detail_url.format(post_id=post.id)
+        ).json()
+        assert data['image_thumbnail'] == data['image'], (
+            'Проверьте, что пока копии не готовы, отдаётся адрес исходного '
+            'изображения.'
+        )
+        assert data['image_webp'] == data['image']
+
+    def test_no_image(self, user_client, post):
+        data = user_client.get(
+            self.post_detail_url.format(post_id=post.id)
+        ).json()
+        assert data['image_thumbnail'] is None and data['image_webp'] is None
+
+    def test_replaced_image_rebuilt(self, user_client, user, media_root):
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': make_image('first.png')},
+            format='multipart'
+        )
+        post_id = response.json()['id']
+        wait_pending(timeout=10)
+        old = Post.objects.get(id=post_id)
+        user_client.patch(
+            self.post_detail_url.format(post_id=post_id),
+            data={'image': make_image('second.png', (100, 100))},
+            format='multipart'
+        )
+        wait_pending(timeout=10)
+        post = Post.objects.get(id=post_id)
+        assert 'second' in post.image_thumbnail.name, (
+            'Проверьте, что при замене изображения копии готовятся заново.'
+        )
+        for variant in (old.image_thumbnail, old.image_webp):
+            assert not variant.storage.exists(variant.name), (
+                'Проверьте, что при замене изображения файлы прежних копий '
+                'удаляются.'
+            )
+
+    def test_text_patch_keeps_variants(self, user_client, media_root):
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': make_image()},
+            format='multipart'
+        )
+        wait_pending(timeout=10)
+        post_id = response.json()['id']
+        before = Post.objects.get(id=post_id)
+        user_client.patch(
+            self.post_detail_url.format(post_id=post_id),
+            data={'text': 'Новый текст'}
+        )
+        post = Post.objects.get(id=post_id)
+        assert post.image_thumbnail == before.image_thumbnail.name, (
+            'Проверьте, что изменение текста не затирает копии изображения.'
+        )
+        assert post.image_webp == before.image_webp.name
+
+    @pytest.mark.parametrize('mode', ['P', 'LA'])
+    def test_transparency_kept(self, user, media_root, mode):
+        image = Image.new('RGBA', (40, 40), (200, 40, 40, 255))
+        image.paste((0, 0, 0, 0), (0, 0, 20, 40))
+        if mode == 'P':
+            image = image.convert('P', palette=Image.Palette.ADAPTIVE, colors=2)
+            transparent = image.getpixel((0, 0))
+            image.info['transparency'] = transparent
+        else:
+            image = image.convert('LA')
+        buffer = BytesIO()
+        image.save(buffer, 'PNG')
+        post = Post.objects.create(
+            text='Пост', author=user, image=SimpleUploadedFile(
+                'image.png', buffer.getvalue(), 'image/png'
+            )
+        )
+        build_variants(post.id, post.image.name)
+        post.refresh_from_db()
+        with Image.open(post.image_webp.path) as webp:
+            assert webp.mode == 'RGBA', (
+                'Проверьте, что копия WebP сохраняет прозрачность исходного '
+                'изображения.'
+            )
+            assert webp.getpixel((0, 0))[3] == 0
+            assert webp.getpixel((30, 0))[3] == 255
+        with Image.open(post.image_thumbnail.path) as thumbnail:
+            assert thumbnail.convert('RGB').getpixel((0, 0)) == (
+                255, 255, 255
+            ), (
+                'Проверьте, что прозрачные области миниатюры JPEG '
+                'заливаются белым.'
+            )
+
+    def test_build_failure_logged(self, user, media_root, caplog):
+        post = Post.objects.create(text='Пост', author=user)
+        build_variants(post.id, 'posts/missing.png')
+        assert 'posts/missing.png' in caplog.text, (
+            'Проверьте, что ошибка подготовки копий попадает в лог.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImageUpload:
+
+    post_list_url = '/api/v1/posts/'
+
+    def upload(self, client, image):
+        return client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': image},
+            format='multipart'
+        )
+
+    def assert_rejected(self, response, message):
+        assert response.status_code == HTTPStatus.BAD_REQUEST, message
+        assert 'image' in response.json(), message
+        assert not Post.objects.exists(), message
+
+    def test_byte_limit(self, user_client, settings, media_root):
+        settings.IMAGE_UPLOAD_MAX_BYTES = 1024
+        response = self.upload(user_client, make_image(size=(400, 400)))
+        self.assert_rejected(
+            response,
+            'Проверьте, что файл больше `IMAGE_UPLOAD_MAX_BYTES` отклоняется '
+            'с ошибкой в поле `image`.'
+        )
+
+    def test_pixel_limit(self, user_client, settings, media_root):
+        settings.IMAGE_UPLOAD_MAX_PIXELS = 100 * 100
+        response = self.upload(user_client, make_image(size=(200, 101)))
+        self.assert_rejected(
+            response,
+            'Проверьте, что изображение больше `IMAGE_UPLOAD_MAX_PIXELS` '
+            'отклоняется с ошибкой в поле `image`.'
+        )
+
+    def test_not_an_image(self, user_client, media_root):
+        response = self.upload(
+            user_client,
+            SimpleUploadedFile('image.png', b'not an image' * 100, 'image/png')
+        )
+        self.assert_rejected(
+            response,
+            'Проверьте, что файл без заголовка изображения отклоняется.'
+        )
+
+    def test_request_too_large(self, user_client, settings, media_root):
+        settings.IMAGE_UPLOAD_MAX_BYTES = 0
+        settings.DATA_UPLOAD_MAX_MEMORY_SIZE = 1024
+        response = self.upload(user_client, make_image(size=(400, 400)))
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос с заведомо большим телом отклоняется до '
+            'чтения файла.'
+        )
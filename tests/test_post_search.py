@@ -0,0 +1,111 @@
+from django.db import connection
+import pytest
+
+from posts.models import Post
+
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверка индекса FTS5 выполняется только на SQLite.'
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostSearch:
+
+    url = '/api/v1/posts/'
+
+    def search(self, client, query, extra=''):
+        response = client.get(self.url, {'search': query, **dict(
+            param.split('=') for param in extra.split('&') if param
+        )})
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{self.url}?search=` возвращает '
+            'ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_search_matches_words(self, client, user):
+        wanted = Post.objects.create(text='Котики и собаки', author=user)
+        Post.objects.create(text='Только собаки', author=user)
+        data = self.search(client, 'котик')
+        assert [item['id'] for item in data] == [wanted.id], (
+            'Проверьте, что параметр `search` находит посты по словам '
+            'текста, без учёта регистра и по началу слова.'
+        )
+
+    def test_ranked(self, client, user):
+        weak = Post.objects.create(
+            text='Рецепт пирога. ' + 'Просто текст. ' * 30, author=user
+        )
+        strong = Post.objects.create(text='Рецепт рецепт рецепт', author=user)
+        data = self.search(client, 'рецепт')
+        assert [item['id'] for item in data] == [strong.id, weak.id], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_index_in_sync(self, client, user):
+        post = Post.objects.create(text='Старый текст', author=user)
+        post.text = 'Новый заголовок'
+        post.save()
+        assert self.search(client, 'старый') == []
+        assert [item['id'] for item in self.search(client, 'заголовок')] == [
+            post.id
+        ], 'Проверьте, что индекс обновляется при изменении поста.'
+        Post.objects.filter(id=post.id).update(text='Ещё один вариант')
+        assert [item['id'] for item in self.search(client, 'вариант')] == [
+            post.id
+        ]
+        post.delete()
+        assert self.search(client, 'вариант') == [], (
+            'Проверьте, что удалённые посты пропадают из поиска.'
+        )
+
+    def test_bulk_created_indexed(self, user_client):
+        user_client.post(
+            f'{self.url}bulk/',
+            data=[{'text': 'Пакетный пост про море'}],
+            format='json'
+        )
+        assert len(self.search(user_client, 'море')) == 1, (
+            'Проверьте, что посты, созданные списком, попадают в индекс.'
+        )
+
+    def test_pagination(self, client, user):
+        for number in range(5):
+            Post.objects.create(text=f'Поиск номер {number}', author=user)
+        Post.objects.create(text='Другое', author=user)
+        data = self.search(client, 'поиск', 'limit=2&offset=2')
+        assert data['count'] == 5 and len(data['results']) == 2, (
+            'Проверьте, что поиск работает с пагинацией limit/offset.'
+        )
+        data = self.search(client, 'поиск', 'cursor=&limit=2')
+        ids = [item['id'] for item in data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            ids.extend(item['id'] for item in data['results'])
+        assert len(ids) == len(set(ids)) == 5, (
+            'Проверьте, что поиск работает с курсорной пагинацией.'
+        )
+
+    def test_special_characters(self, client, user):
+        Post.objects.create(text='Текст', author=user)
+        assert self.search(client, '"AND OR * (') == [], (
+            'Проверьте, что служебные символы запроса не ломают поиск.'
+        )
+        assert len(self.search(client, '(текст)*')) == 1
+
+    def test_uses_fts_index(self, user):
+        from posts.search import search_posts
+
+        queryset = search_posts(Post.objects.all(), 'пост')
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'VIRTUAL TABLE INDEX' in plan, (
+            f'Проверьте, что поиск использует индекс FTS5: {plan}'
+        )
+        assert 'SEARCH posts_post USING INTEGER PRIMARY KEY' in plan, (
+            f'Проверьте, что посты читаются по id из индекса: {plan}'
+        )
@@ -0,0 +1,79 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+from rest_framework.test import APIClient
+
+from api import profiling
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@pytest.fixture
+def profiled_client(settings, token, monkeypatch):
+    settings.PROFILING_ENABLED = True
+    records = []
+    monkeypatch.setattr(
+        profiling.logger, 'info', lambda message: records.append(message)
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token["access"]}')
+    client.records = records
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class TestProfilingMiddleware:
+
+    def test_disabled_by_default(self, user_client, post):
+        response = user_client.get('/api/v1/posts/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что профилирование выключено, пока не задана '
+            'настройка `PROFILING_ENABLED`.'
+        )
+
+    def test_list_breakdown(self, profiled_client, post, post_2):
+        with CaptureQueriesContext(connection) as context:
+            response = profiled_client.get('/api/v1/posts/')
+        metrics = parse_server_timing(response['Server-Timing'])
+        for name in (
+            'auth', 'permissions', 'queryset', 'serialize', 'render', 'sql',
+            'total'
+        ):
+            assert name in metrics, (
+                f'Проверьте, что заголовок `Server-Timing` содержит этап '
+                f'`{name}`.'
+            )
+            assert float(metrics[name]['dur']) >= 0
+        assert metrics['sql']['desc'] == (
+            f'"{len(context.captured_queries)} queries"'
+        ), 'Проверьте, что в профиле учтены все SQL-запросы.'
+
+    def test_json_log(self, profiled_client, post):
+        profiled_client.get(f'/api/v1/posts/{post.id}/')
+        assert len(profiled_client.records) == 1, (
+            'Проверьте, что профиль каждого запроса пишется в журнал.'
+        )
+        record = json.loads(profiled_client.records[0])
+        assert record['route'] == 'posts-detail'
+        assert record['method'] == 'GET' and record['status'] == 200
+        assert record['sql_count'] > 0
+        assert {'auth', 'permissions', 'queryset', 'serialize'} <= set(
+            record['timings_ms']
+        )
+        assert record['total_ms'] >= max(record['timings_ms'].values())
+
+    def test_object_permissions(self, profiled_client, post):
+        response = profiled_client.patch(
+            f'/api/v1/posts/{post.id}/', data={'text': 'Новый текст'}
+        )
+        assert 'permissions' in parse_server_timing(
+            response['Server-Timing']
+        )
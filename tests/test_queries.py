@@ -0,0 +1,87 @@
+from http import HTTPStatus
+from itertools import count
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Comment, Follow, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryCount:
+
+    PAGE_SIZES = (1, 5, 20)
+    usernames = (f'reader_{number}' for number in count())
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return len(context.captured_queries)
+
+    def assert_constant_queries(self, client, url, expected, fill):
+        for size in self.PAGE_SIZES:
+            fill(size)
+            queries = self.count_queries(client, url)
+            assert queries == expected, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет {expected} '
+                f'SQL-запрос(а) независимо от размера страницы: при {size} '
+                f'записях выполнено {queries}.'
+            )
+
+    def test_posts_list(self, client, django_user_model):
+        def fill(size):
+            Post.objects.all().delete()
+            for number in range(size):
+                author = django_user_model.objects.create(
+                    username=next(self.usernames)
+                )
+                Post.objects.create(text='Пост', author=author)
+
+        self.assert_constant_queries(client, '/api/v1/posts/', 2, fill)
+        self.assert_constant_queries(
+            client, '/api/v1/posts/?limit=50&offset=0', 3, fill
+        )
+        self.assert_constant_queries(
+            client, '/api/v1/posts/?cursor=&limit=50', 2, fill
+        )
+
+    def test_comments_list(self, client, post, django_user_model):
+        def fill(size):
+            Comment.objects.all().delete()
+            for number in range(size):
+                author = django_user_model.objects.create(
+                    username=next(self.usernames)
+                )
+                Comment.objects.create(author=author, post=post, text='Ок')
+
+        self.assert_constant_queries(
+            client, f'/api/v1/posts/{post.id}/comments/', 2, fill
+        )
+
+    def test_follow_list(self, user_client, user, django_user_model):
+        def fill(size):
+            Follow.objects.all().delete()
+            for number in range(size):
+                following = django_user_model.objects.create(
+                    username=next(self.usernames)
+                )
+                Follow.objects.create(user=user, following=following)
+
+        # Первый запрос загружает пользователя токена в кэш аутентификации.
+        self.count_queries(user_client, '/api/v1/follow/')
+        self.assert_constant_queries(user_client, '/api/v1/follow/', 1, fill)
+
+    def test_groups_list(self, client):
+        def fill(size):
+            Group.objects.all().delete()
+            for number in range(size):
+                Group.objects.create(
+                    title=f'Группа {number}', slug=f'group_{size}_{number}'
+                )
+
+        self.assert_constant_queries(client, '/api/v1/groups/', 2, fill)
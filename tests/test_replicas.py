@@ -0,0 +1,129 @@
+from http import HTTPStatus
+from io import StringIO
+import sqlite3
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+import pytest
+from rest_framework.test import APIClient
+
+from api.replicas import PIN_COOKIE, ReplicaRouter, ReplicaState, current_state
+from posts.models import Group, Post
+
+
+REPLICA = 'replica_0'
+
+
+class TestReplicaRouter:
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.DATABASE_REPLICAS = {REPLICA: {}}
+
+    def read_alias(self, state):
+        token = current_state.set(state)
+        try:
+            return ReplicaRouter().db_for_read(Post)
+        finally:
+            current_state.reset(token)
+
+    def test_routing(self):
+        assert self.read_alias(None) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что чтение вне HTTP-запроса идёт в основную базу.'
+        )
+        assert self.read_alias(ReplicaState(pinned=False)) == REPLICA, (
+            'Проверьте, что чтение в безопасном запросе идёт в реплику.'
+        )
+        assert self.read_alias(ReplicaState(pinned=True)) == DEFAULT_DB_ALIAS
+        assert ReplicaRouter().db_for_write(Post) == DEFAULT_DB_ALIAS
+        assert not ReplicaRouter().allow_migrate(REPLICA, 'posts')
+        assert ReplicaRouter().allow_migrate(DEFAULT_DB_ALIAS, 'posts')
+
+    def test_no_replicas(self, settings):
+        settings.DATABASE_REPLICAS = {}
+        assert self.read_alias(ReplicaState(pinned=False)) == DEFAULT_DB_ALIAS
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    path = tmp_path / 'replica.sqlite3'
+    connections.databases[REPLICA] = {
+        **connections.databases[DEFAULT_DB_ALIAS],
+        'NAME': str(path),
+        'TEST': {},
+    }
+    settings.DATABASE_REPLICAS = {REPLICA: connections.databases[REPLICA]}
+    call_command('sync_replicas', stdout=StringIO())
+    yield path
+    connections[REPLICA].close()
+    del connections.databases[REPLICA]
+    delattr(connections._connections, REPLICA)
+
+
+@pytest.mark.skipif(
+    connections[DEFAULT_DB_ALIAS].vendor != 'sqlite',
+    reason='Реплика в тесте — отдельный файл SQLite.'
+)
+@pytest.mark.django_db(transaction=True)
+class TestReadYourWrites:
+
+    url = '/api/v1/posts/'
+
+    def get_ids(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        return {item['id'] for item in response.json()}
+
+    def test_reads_from_replica(self, client, post, replica, user):
+        fresh = Post.objects.create(text='Новый пост', author=user)
+        ids = self.get_ids(client)
+        assert post.id in ids and fresh.id not in ids, (
+            'Проверьте, что безопасные запросы читают данные с реплики.'
+        )
+
+    def test_writer_pinned_to_primary(self, user_client, token, post,
+                                      replica):
+        response = user_client.post(self.url, data={'text': 'Мой пост'})
+        assert response.status_code == HTTPStatus.CREATED
+        post_id = response.json()['id']
+        assert PIN_COOKIE in response.cookies
+        assert post_id in self.get_ids(user_client), (
+            'Проверьте, что автор записи сразу видит её в списке.'
+        )
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token["access"]}')
+        assert post_id in self.get_ids(client), (
+            'Проверьте, что пользователь закреплён за основной базой и без '
+            'cookie, по отметке в кэше.'
+        )
+
+        cache.clear()
+        assert post_id not in self.get_ids(client), (
+            'Проверьте, что после окончания закрепления чтение снова идёт '
+            'с реплики.'
+        )
+        with sqlite3.connect(replica) as replica_connection:
+            count, = replica_connection.execute(
+                'SELECT COUNT(*) FROM posts_post'
+            ).fetchone()
+        assert count == 1, 'Проверьте, что запись не попадает в реплику.'
+
+    def test_replica_reads_not_cached(self, client, replica):
+        group = Group.objects.create(title='Группа', slug='fresh')
+        for _ in range(2):
+            response = client.get('/api/v1/groups/')
+            assert response['X-Cache'] == 'MISS', (
+                'Проверьте, что ответ, прочитанный с реплики, не сохраняется '
+                'в кэш групп под новой версией.'
+            )
+            assert group.id not in {item['id'] for item in response.json()}
+        call_command('sync_replicas', stdout=StringIO())
+        response = client.get('/api/v1/groups/')
+        assert group.id in {item['id'] for item in response.json()}
+
+    def test_sync_replicas(self, client, post, replica, user):
+        fresh = Post.objects.create(text='Новый пост', author=user)
+        call_command('sync_replicas', stdout=StringIO())
+        assert fresh.id in self.get_ids(client)
@@ -0,0 +1,164 @@
+from http import HTTPStatus
+from threading import Thread
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import (
+    CacheThrottleStorage,
+    SlidingWindowAnonRateThrottle,
+    SQLiteThrottleStorage
+)
+
+
+class FakeTimer:
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['cache', 'sqlite'])
+def storage(request, tmp_path):
+    if request.param == 'cache':
+        cache.clear()
+        return CacheThrottleStorage()
+    return SQLiteThrottleStorage(tmp_path / 'throttle.sqlite3')
+
+
+@pytest.fixture
+def throttle(storage, monkeypatch):
+    monkeypatch.setattr(
+        'api.throttling.get_throttle_storage', lambda: storage
+    )
+    timer = FakeTimer(now=600)
+
+    def make():
+        throttle = SlidingWindowAnonRateThrottle()
+        throttle.rate = '3/min'
+        throttle.num_requests, throttle.duration = throttle.parse_rate(
+            throttle.rate
+        )
+        throttle.timer = timer
+        return throttle
+
+    make.timer = timer
+    return make
+
+
+def make_request():
+    request = APIRequestFactory().get('/api/v1/posts/')
+    request.user = AnonymousUser()
+    return request
+
+
+def allowed(throttle, count):
+    request = make_request()
+    return [
+        throttle().allow_request(request, None) for _ in range(count)
+    ]
+
+
+class TestSlidingWindowThrottle:
+
+    def test_limit_within_window(self, throttle):
+        assert allowed(throttle, 4) == [True, True, True, False], (
+            'Проверьте, что после исчерпания лимита запросы отклоняются.'
+        )
+
+    def test_previous_window_weighted(self, throttle):
+        allowed(throttle, 3)
+        throttle.timer.now += 60 + 20
+        assert allowed(throttle, 2) == [True, False], (
+            'Проверьте, что запросы предыдущего окна учитываются с весом '
+            'непрошедшей части периода.'
+        )
+        throttle.timer.now += 40
+        assert allowed(throttle, 1) == [True]
+
+    def test_rejected_not_counted(self, throttle):
+        allowed(throttle, 3)
+        throttle.timer.now += 30
+        assert allowed(throttle, 5) == [False] * 5
+        throttle.timer.now += 30 + 20
+        assert allowed(throttle, 2) == [True, False], (
+            'Проверьте, что отклонённые запросы не учитываются в счётчиках '
+            'и повторы не продлевают блокировку.'
+        )
+
+    def test_wait(self, throttle):
+        allowed(throttle, 3)
+        request = make_request()
+        instance = throttle()
+        assert not instance.allow_request(request, None)
+        assert instance.wait() == 80
+        throttle.timer.now += 80
+        assert allowed(throttle, 1) == [True], (
+            'Проверьте, что `wait()` возвращает время до первого запроса, '
+            'который будет пропущен.'
+        )
+
+    def test_keys_bounded(self, throttle, storage):
+        for _ in range(5):
+            allowed(throttle, 2)
+            throttle.timer.now += 60
+        if isinstance(storage, SQLiteThrottleStorage):
+            rows = storage.get_connection().execute(
+                'SELECT COUNT(*) FROM throttle_window'
+            ).fetchone()[0]
+            assert rows <= 2, (
+                'Проверьте, что на ключ хранится не больше двух счётчиков.'
+            )
+
+
+def test_sqlite_prunes_expired_windows(tmp_path):
+    storage = SQLiteThrottleStorage(tmp_path / 'throttle.sqlite3')
+    storage.prune_interval = 2
+    storage.hit('idle', 1, 60)
+    storage.hit('active', 1, 60)
+    assert storage.hit('active', 3, 60) == (1, 0)
+    storage.hit('active', 3, 60)
+    keys = {
+        key for key, in storage.get_connection().execute(
+            'SELECT key FROM throttle_window'
+        )
+    }
+    assert keys == {'active'}, (
+        'Проверьте, что периодическая очистка удаляет окна ключей, по '
+        'которым больше нет запросов.'
+    )
+
+
+def test_sqlite_shared_between_connections(tmp_path):
+    path = tmp_path / 'throttle.sqlite3'
+    workers = [SQLiteThrottleStorage(path) for _ in range(4)]
+
+    def hit(storage):
+        for _ in range(50):
+            storage.hit('key', 1, 60)
+
+    threads = [Thread(target=hit, args=(storage,)) for storage in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert workers[0].hit('key', 1, 60) == (201, 0), (
+        'Проверьте, что счётчики в SQLite общие для всех соединений и '
+        'увеличиваются атомарно.'
+    )
+
+
+@pytest.mark.django_db
+def test_api_throttled(client, monkeypatch):
+    monkeypatch.setattr(
+        SlidingWindowAnonRateThrottle, 'THROTTLE_RATES', {'anon': '2/min'}
+    )
+    statuses = [client.get('/api/v1/posts/').status_code for _ in range(3)]
+    assert statuses == [
+        HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.TOO_MANY_REQUESTS
+    ], 'Проверьте, что API отклоняет запросы сверх лимита со статусом 429.'
+    response = client.get('/api/v1/posts/')
+    assert int(response['Retry-After']) > 0
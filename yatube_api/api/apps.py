@@ -7,3 +7,7 @@ class ApiConfig(AppConfig):
     """Класс для создания нового приложения."""
 
     name = 'api'
+
+    def ready(self):
+        """Подключение обработчиков сигналов."""
+        from . import signals  # noqa: F401
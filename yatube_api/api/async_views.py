@@ -0,0 +1,47 @@
+"""Асинхронные точки входа для чтения списков и отдельных записей."""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+from rest_framework import permissions
+
+
+def async_read_view(view):
+    """Асинхронная обёртка: чтение выполняется в пуле рабочих потоков."""
+    def read(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)):
+                response.render()
+            return response
+        finally:
+            # Соединения потоков пула не закрываются по request_finished,
+            # поэтому их время жизни проверяется сразу после запроса.
+            close_old_connections()
+
+    run_read = sync_to_async(read, thread_sensitive=False)
+    run_write = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in permissions.SAFE_METHODS:
+            return await run_read(request, *args, **kwargs)
+        return await run_write(request, *args, **kwargs)
+
+    return async_view
+
+
+def async_read_urls(urls, route_names):
+    """Маршруты, в которых выбранные представления стали асинхронными."""
+    return [
+        URLPattern(
+            pattern.pattern,
+            async_read_view(pattern.callback),
+            pattern.default_args,
+            pattern.name
+        )
+        if pattern.name in route_names else pattern
+        for pattern in urls
+    ]
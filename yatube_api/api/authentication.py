@@ -0,0 +1,37 @@
+"""Классы аутентификации для приложения API."""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import user_cache
+from .replicas import check_user_pin
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кэшированием пользователя по id из токена.
+
+    Пользователь, недавно записывавший данные, читает из основной базы.
+    """
+
+    def get_user(self, validated_token):
+        """Пользователь из кэша или из базы данных при промахе."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        user = user_cache.get(user_id)
+        if user is None:
+            stamp = user_cache.get_stamp(user_id)
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, stamp)
+        elif not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        check_user_pin(user)
+        return user
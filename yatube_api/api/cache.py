@@ -0,0 +1,148 @@
+"""Кэши ответов и пользователей приложения API."""
+
+from collections import OrderedDict
+from copy import copy
+from hashlib import sha1
+from threading import Lock
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import registry
+
+
+class VersionedResponseCache:
+    """Кэш данных ответов, сбрасываемый сменой версии коллекции."""
+
+    def __init__(self, prefix, timeout=None):
+        """Кэш с префиксом ключей и временем жизни записей."""
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def get_version(self):
+        """Текущая версия закэшированных ответов."""
+        return cache.get_or_set(f'{self.prefix}:version', 1, None)
+
+    def get_key(self, request):
+        """Ключ ответа для адреса запроса и формата ответа."""
+        digest = sha1(
+            f'{request.get_full_path()}:{request.accepted_media_type}'.encode()
+        ).hexdigest()
+        return f'{self.prefix}:{self.get_version()}:{digest}'
+
+    def get(self, request):
+        """Данные ответа из кэша с учётом попаданий и промахов."""
+        data = cache.get(self.get_key(request))
+        self.count('hits' if data is not None else 'misses')
+        registry.inc(
+            'cache_requests_total', cache=self.prefix,
+            result='hit' if data is not None else 'miss'
+        )
+        return data
+
+    def set(self, request, data):
+        """Сохранение данных ответа в кэше."""
+        cache.set(self.get_key(request), data, self.timeout)
+
+    def invalidate(self):
+        """Сброс всех ответов переходом на новую версию."""
+        try:
+            cache.incr(f'{self.prefix}:version')
+        except ValueError:
+            cache.set(f'{self.prefix}:version', 2, None)
+
+    def count(self, name):
+        """Увеличение счётчика попаданий или промахов."""
+        key = f'{self.prefix}:stats:{name}'
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+    def stats(self):
+        """Счётчики попаданий и промахов кэша."""
+        keys = {
+            name: f'{self.prefix}:stats:{name}' for name in ('hits', 'misses')
+        }
+        values = cache.get_many(keys.values())
+        return {name: values.get(key, 0) for name, key in keys.items()}
+
+
+class UserCache:
+    """Ограниченный LRU-кэш пользователей с временем жизни записей.
+
+    Записи хранятся в памяти процесса, а их актуальность сверяется с меткой
+    в кэше Django. Сброс метки виден другим рабочим процессам, только если
+    кэш Django общий (`file` или `redis`); с `locmem` он действует лишь в
+    процессе, изменившем пользователя.
+    """
+
+    def __init__(self, prefix, max_size, timeout):
+        """Кэш на `max_size` пользователей, живущих `timeout` секунд."""
+        self.prefix = prefix
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get_stamp(self, user_id):
+        """Метка актуальности записей пользователя из общего кэша."""
+        return cache.get_or_set(
+            f'{self.prefix}:{user_id}', uuid4().hex, self.timeout
+        )
+
+    def get(self, user_id):
+        """Копия пользователя из кэша или None, если записи нет."""
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None:
+                self.entries.move_to_end(user_id)
+        if entry is not None:
+            user, stamp, expires = entry
+            if expires < time.monotonic() or stamp != self.get_stamp(user_id):
+                with self.lock:
+                    self.entries.pop(user_id, None)
+                entry = None
+        registry.inc(
+            'cache_requests_total', cache=self.prefix,
+            result='miss' if entry is None else 'hit'
+        )
+        return None if entry is None else copy(user)
+
+    def set(self, user_id, user, stamp):
+        """Сохранение пользователя с вытеснением давно не нужных записей.
+
+        Метку `stamp` нужно получить через get_stamp до загрузки
+        пользователя из базы: если пользователь изменится между загрузкой и
+        сохранением, запись не пройдёт сверку с новой меткой.
+        """
+        entry = (copy(user), stamp, time.monotonic() + self.timeout)
+        with self.lock:
+            self.entries[user_id] = entry
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Сброс записей пользователя во всех процессах."""
+        cache.delete(f'{self.prefix}:{user_id}')
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        """Очистка записей текущего процесса."""
+        with self.lock:
+            self.entries.clear()
+
+
+group_cache = VersionedResponseCache(
+    'groups', timeout=settings.GROUP_CACHE_TIMEOUT
+)
+user_cache = UserCache(
+    'auth_user',
+    max_size=settings.AUTH_USER_CACHE_SIZE,
+    timeout=settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+)
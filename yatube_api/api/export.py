@@ -0,0 +1,39 @@
+"""Потоковая выгрузка постов с комментариями."""
+
+from posts.models import Comment
+from .renderers import ndjson_line
+from .serializers import CommentSerializer, PostSerializer
+
+
+def export_posts(queryset, chunk_size, context=None):
+    """Посты с комментариями построчно, порциями по chunk_size постов."""
+    batch = []
+    for post in queryset.order_by('id').iterator(chunk_size=chunk_size):
+        batch.append(post)
+        if len(batch) == chunk_size:
+            yield from export_batch(batch, chunk_size, context)
+            batch = []
+    if batch:
+        yield from export_batch(batch, chunk_size, context)
+
+
+def export_batch(posts, chunk_size, context):
+    """Строки NDJSON для порции постов с одной выборкой комментариев."""
+    post_serializer = PostSerializer(context=context)
+    comment_serializer = CommentSerializer(context=context)
+    comments = (
+        Comment.objects.filter(post__in=posts)
+        .select_related('author')
+        .order_by('post_id', 'id')
+        .iterator(chunk_size=chunk_size)
+    )
+    comment = next(comments, None)
+    for post in posts:
+        data = post_serializer.to_representation(post)
+        data['comments'] = []
+        while comment is not None and comment.post_id == post.id:
+            data['comments'].append(
+                comment_serializer.to_representation(comment)
+            )
+            comment = next(comments, None)
+        yield ndjson_line(data)
@@ -0,0 +1,78 @@
+"""Фильтры списков для приложения API."""
+
+from datetime import datetime, time
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from posts.models import Group
+from posts.search import search_posts
+
+
+def get_date_param(request, name):
+    """Дата или дата и время из параметра запроса."""
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and parse_date(value) is not None:
+            parsed = datetime.combine(parse_date(value), time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError(
+            {name: 'Ожидается дата в формате ISO 8601.'}
+        )
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class PostFilter(BaseFilterBackend):
+    """Фильтр постов по группе, автору и дате публикации.
+
+    Каждый фильтр сужает выборку по столбцу с индексом: `group` — по
+    id или slug группы, `author` — по имени пользователя, `since` и
+    `until` — по полуинтервалу дат публикации.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Посты, подходящие под параметры запроса."""
+        params = request.query_params
+        group = params.get('group')
+        if group:
+            # Slug из одних цифр тоже допустим, поэтому число сверяется
+            # и с id, и со slug группы.
+            groups = Q(slug=group)
+            if group.isdigit():
+                groups |= Q(id=int(group))
+            queryset = queryset.filter(
+                group__in=Group.objects.filter(groups).values('id')
+            )
+        author = params.get('author')
+        if author:
+            queryset = queryset.filter(author__username=author)
+        since = get_date_param(request, 'since')
+        if since:
+            queryset = queryset.filter(pub_date__gte=since)
+        until = get_date_param(request, 'until')
+        if until:
+            queryset = queryset.filter(pub_date__lt=until)
+        return queryset
+
+
+class PostSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск постов по параметру `search`."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        """Посты, подходящие под запрос, или все посты без запроса."""
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_posts(queryset, query)
@@ -0,0 +1,317 @@
+"""Метрики API в текстовом формате Prometheus."""
+
+import asyncio
+from bisect import bisect_left
+from contextvars import ContextVar
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'http_requests_total': (
+        'counter', 'Число обработанных запросов.', None
+    ),
+    'http_request_duration_seconds': (
+        'histogram', 'Время обработки запроса.', LATENCY_BUCKETS
+    ),
+    'db_queries_per_request': (
+        'histogram', 'Число SQL-запросов на один запрос.', QUERY_BUCKETS
+    ),
+    'db_duration_seconds': (
+        'histogram', 'Время SQL-запросов на один запрос.', LATENCY_BUCKETS
+    ),
+    'throttle_rejections_total': (
+        'counter', 'Число запросов, отклонённых ограничением частоты.', None
+    ),
+    'cache_requests_total': (
+        'counter', 'Число обращений к кэшу по результату.', None
+    ),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+current_queries = ContextVar('current_queries', default=None)
+
+
+class MetricsRegistry:
+    """Счётчики и гистограммы процесса с выгрузкой в общий каталог.
+
+    Каждый рабочий процесс копит значения в памяти и не чаще раза в
+    `flush_interval` секунд записывает их в свой файл каталога
+    `directory`; при выдаче метрик файлы всех процессов суммируются.
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        """Пустой реестр; без каталога метрики видны только в процессе."""
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Очистка значений, например в процессе после fork."""
+        self.pid = os.getpid()
+        self.values = {name: {} for name in METRICS}
+        self.flushed = monotonic()
+
+    def check_pid(self):
+        """Сброс значений, унаследованных от родительского процесса."""
+        if self.pid != os.getpid():
+            self.reset()
+
+    def inc(self, name, amount=1, **labels):
+        """Увеличение счётчика с метками."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.check_pid()
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """Учёт значения в гистограмме с метками."""
+        key = tuple(sorted(labels.items()))
+        buckets = METRICS[name][2]
+        index = bisect_left(buckets, value)
+        with self.lock:
+            self.check_pid()
+            series = self.values[name]
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [[0] * (len(buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self):
+        """Значения процесса в виде, пригодном для JSON."""
+        with self.lock:
+            self.check_pid()
+            return {
+                name: [
+                    [dict(key), copy_value(value)]
+                    for key, value in series.items()
+                ]
+                for name, series in self.values.items()
+            }
+
+    def flush(self, force=False):
+        """Запись значений процесса в его файл, если подошло время."""
+        if self.directory is None:
+            return
+        if not force and monotonic() - self.flushed < self.flush_interval:
+            return
+        self.flushed = monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f'{os.getpid()}.json'
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, path)
+
+    def collect(self):
+        """Сумма значений всех процессов."""
+        if self.directory is None:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush(force=True)
+            snapshots = [
+                json.loads(path.read_text())
+                for path in self.directory.glob('*.json')
+            ]
+        merged = {name: {} for name in METRICS}
+        for snapshot in snapshots:
+            for name, series in snapshot.items():
+                if name not in merged:
+                    continue
+                for labels, value in series:
+                    key = tuple(sorted(labels.items()))
+                    merged[name][key] = merge_values(
+                        merged[name].get(key), value
+                    )
+        return merged
+
+    def render(self):
+        """Метрики в текстовом формате Prometheus."""
+        merged = self.collect()
+        lines = []
+        for name, (kind, documentation, buckets) in METRICS.items():
+            full_name = f'{settings.METRICS_PREFIX}_{name}'
+            lines.append(f'# HELP {full_name} {documentation}')
+            lines.append(f'# TYPE {full_name} {kind}')
+            for key, value in sorted(merged[name].items()):
+                if kind == 'counter':
+                    lines.append(
+                        f'{full_name}{format_labels(key)} {value}'
+                    )
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket in zip((*buckets, '+Inf'), counts):
+                    cumulative += bucket
+                    lines.append(
+                        f'{full_name}_bucket'
+                        f'{format_labels(key, le=bound)} {cumulative}'
+                    )
+                lines.append(f'{full_name}_sum{format_labels(key)} {total}')
+                lines.append(f'{full_name}_count{format_labels(key)} {count}')
+        lines.extend(render_cache_ratios(merged['cache_requests_total']))
+        return '\n'.join(lines) + '\n'
+
+
+def copy_value(value):
+    """Копия значения счётчика или гистограммы."""
+    if isinstance(value, list):
+        return [list(value[0]), value[1], value[2]]
+    return value
+
+
+def merge_values(current, value):
+    """Сумма двух значений счётчика или гистограммы."""
+    if current is None:
+        return value
+    if isinstance(value, list):
+        return [
+            [first + second for first, second in zip(current[0], value[0])],
+            current[1] + value[1],
+            current[2] + value[2],
+        ]
+    return current + value
+
+
+def format_labels(key, **extra):
+    """Метки серии в формате `{name="value",...}`."""
+    labels = [*key, *extra.items()]
+    if not labels:
+        return ''
+    formatted = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', r'\\').replace('"', r'\"')
+        )
+        for name, value in labels
+    )
+    return f'{{{formatted}}}'
+
+
+def render_cache_ratios(series):
+    """Доля попаданий для каждого кэша."""
+    totals = {}
+    for key, value in series.items():
+        labels = dict(key)
+        hits, count = totals.get(labels['cache'], (0, 0))
+        if labels['result'] == 'hit':
+            hits += value
+        totals[labels['cache']] = (hits, count + value)
+    name = f'{settings.METRICS_PREFIX}_cache_hit_ratio'
+    lines = [
+        f'# HELP {name} Доля попаданий в кэш.',
+        f'# TYPE {name} gauge',
+    ]
+    for cache_name, (hits, count) in sorted(totals.items()):
+        lines.append(
+            f'{name}{format_labels((("cache", cache_name),))} '
+            f'{hits / count if count else 0}'
+        )
+    return lines
+
+
+registry = MetricsRegistry(
+    settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL
+)
+
+
+def count_sql(execute, sql, params, many, context):
+    """Учёт числа и длительности SQL-запросов текущего запроса."""
+    queries = current_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries[0] += 1
+        queries[1] += perf_counter() - start
+
+
+def install_sql_counter(sender=None, connection=None, **kwargs):
+    """Подключение учёта SQL к соединению с базой данных."""
+    if count_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_sql)
+
+
+class MetricsMiddleware:
+    """Учёт числа, длительности и SQL-запросов по маршрутам."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Подключение учёта SQL к новым соединениям."""
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Под ASGI цепочка остаётся асинхронной, без общего потока.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        connection_created.connect(install_sql_counter)
+
+    def __call__(self, request):
+        """Обработка запроса с записью метрик по имени маршрута."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        queries, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        self.finish(request, response, queries, start)
+        return response
+
+    async def __acall__(self, request):
+        """Асинхронный вариант обработки запроса."""
+        queries, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        self.finish(request, response, queries, start)
+        return response
+
+    def start(self):
+        """Счётчик SQL текущего запроса и время начала."""
+        for connection in connections.all():
+            install_sql_counter(connection=connection)
+        queries = [0, 0.0]
+        return queries, current_queries.set(queries), perf_counter()
+
+    def finish(self, request, response, queries, start):
+        """Запись метрик обработанного запроса."""
+        duration = perf_counter() - start
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name else 'unmatched'
+        registry.inc(
+            'http_requests_total', route=route, method=request.method,
+            status=response.status_code
+        )
+        registry.observe(
+            'http_request_duration_seconds', duration,
+            route=route, method=request.method
+        )
+        registry.observe('db_queries_per_request', queries[0], route=route)
+        registry.observe('db_duration_seconds', queries[1], route=route)
+        registry.flush()
+
+
+def metrics_view(request):
+    """Метрики всех рабочих процессов в формате Prometheus."""
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,214 @@
+"""Классы пагинации для приложения API."""
+
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    CursorPagination,
+    LimitOffsetPagination,
+    _reverse_ordering
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по составному ключу (pub_date, id)."""
+
+    ordering = ('pub_date', 'id')
+    page_size = 10
+    page_size_query_param = 'limit'
+
+    def __init__(self):
+        """Потолок размера страницы из настройки PAGINATION_MAX_LIMIT."""
+        self.max_page_size = settings.PAGINATION_MAX_LIMIT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Получение страницы записей, следующих за позицией курсора."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+
+        # Ключ (pub_date, id) уникален, поэтому смещение внутри позиции
+        # не нужно: достаточно одной лишней записи для признака продолжения.
+        results = self.get_results(queryset, position, reverse)
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = following_position is not None
+            self.next_position = position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = position is not None
+            self.next_position = following_position
+            self.previous_position = position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_results(self, queryset, position, reverse):
+        """Записи после позиции курсора и одна лишняя для продолжения."""
+        queryset = queryset.order_by(*self.get_order(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+        return list(queryset[:self.page_size + 1])
+
+    def get_order(self, reverse, fields=None):
+        """Порядок выборки с учётом направления курсора."""
+        ordering = self.ordering
+        if fields is not None:
+            ordering = [
+                ('-' if field.startswith('-') else '') + name
+                for field, name in zip(ordering, fields)
+            ]
+        return _reverse_ordering(ordering) if reverse else tuple(ordering)
+
+    def get_keyset_filter(self, position, fields=None):
+        """Условие выборки записей строго после позиции курсора."""
+        first, second = fields or (
+            field.lstrip('-') for field in self.ordering
+        )
+        descending = self.ordering[0].startswith('-')
+        lookup = 'lt' if self.cursor.reverse != descending else 'gt'
+        first_value, second_value = self.decode_position(position)
+        return (
+            Q(**{f'{first}__{lookup}': first_value})
+            | Q(**{first: first_value, f'{second}__{lookup}': second_value})
+        )
+
+    def decode_position(self, position):
+        """Разбор позиции курсора на дату публикации и id."""
+        first_value, _, second_value = position.rpartition('|')
+        first_value = parse_datetime(first_value)
+        if first_value is None or not second_value.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        return first_value, int(second_value)
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Позиция записи в виде строки `pub_date|id`."""
+        values = []
+        for field in ordering:
+            field_name = field.lstrip('-')
+            if isinstance(instance, dict):
+                values.append(str(instance[field_name]))
+            else:
+                values.append(str(getattr(instance, field_name)))
+        return '|'.join(values)
+
+
+class FeedPagination(KeysetPagination):
+    """Курсорная пагинация ленты подписок от новых постов к старым.
+
+    Представление передаёт пару выборок: записи ленты пользователя и посты
+    популярных авторов. Каждая читается по курсору отдельно, а страница
+    собирается слиянием результатов.
+    """
+
+    ordering = ('-pub_date', '-id')
+    entry_fields = ('pub_date', 'post_id')
+
+    def get_results(self, queryset, position, reverse):
+        """Слияние страниц записей ленты и постов популярных авторов."""
+        entries, posts = queryset
+        size = self.page_size + 1
+        entries = entries.order_by(
+            *self.get_order(reverse, self.entry_fields)
+        )
+        posts = posts.order_by(*self.get_order(reverse))
+        if position is not None:
+            entries = entries.filter(
+                self.get_keyset_filter(position, self.entry_fields)
+            )
+            posts = posts.filter(self.get_keyset_filter(position))
+        # Пост автора, ставшего популярным, может быть в обеих выборках.
+        merged = {post.id: post for post in posts[:size]}
+        merged.update((entry.post_id, entry.post) for entry in entries[:size])
+        descending = self.ordering[0].startswith('-') != reverse
+        return sorted(
+            merged.values(), key=attrgetter('pub_date', 'id'),
+            reverse=descending
+        )[:size]
+
+
+class BoundedLimitOffsetPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с потолком числа записей в ответе.
+
+    Без параметра `limit` ответ остаётся списком, но содержит не больше
+    PAGINATION_MAX_LIMIT записей, а адрес продолжения передаётся
+    в заголовке Link. Больший или некорректный `limit` заменяется потолком.
+    """
+
+    def __init__(self):
+        """Потолок и размер страницы по умолчанию из настроек."""
+        self.max_limit = settings.PAGINATION_MAX_LIMIT
+        self.default_limit = self.max_limit
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Страница записей или ограниченный список без параметра `limit`."""
+        self.unwrapped = self.limit_query_param not in request.query_params
+        if not self.unwrapped:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.limit = self.max_limit
+        self.offset = self.get_offset(request)
+        # Одна лишняя запись показывает, есть ли продолжение списка.
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_more = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_paginated_response(self, data):
+        """Страница в обёртке или список с заголовком Link на продолжение."""
+        if not self.unwrapped:
+            return super().get_paginated_response(data)
+        response = Response(data)
+        if self.has_more:
+            url = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.limit_query_param, self.limit
+            )
+            url = replace_query_param(
+                url, self.offset_query_param, self.offset + self.limit
+            )
+            response['Link'] = f'<{url}>; rel="next"'
+        return response
+
+
+class PostPagination(BoundedLimitOffsetPagination):
+    """Пагинация постов: limit/offset по умолчанию, курсор по запросу."""
+
+    cursor_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбор режима пагинации по наличию параметра `cursor`."""
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            self.cursor_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        """Ответ в формате выбранного режима пагинации."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,50 @@
+"""Парсеры тела запроса для приложения API."""
+
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, MultiPartParser
+
+from .uploads import StreamingImageUploadHandler
+
+
+class NDJSONParser(BaseParser):
+    """Парсер потока JSON-объектов, по одному объекту в строке.
+
+    Тело читается по строкам, и чтение прекращается, как только объектов
+    становится больше BULK_POSTS_MAX.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбор строк тела запроса в список объектов."""
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for number, line in enumerate(stream, start=1):
+            try:
+                line = line.decode(encoding).strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+            except ValueError as error:
+                raise ParseError(f'Строка {number}: {error}')
+            if len(items) == settings.BULK_POSTS_MAX:
+                raise ParseError(
+                    'Слишком много постов в одном запросе, '
+                    f'максимум {settings.BULK_POSTS_MAX}.'
+                )
+            items.append(item)
+        return items
+
+
+class ImageMultiPartParser(MultiPartParser):
+    """Парсер multipart-запросов с потоковой загрузкой изображений."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбор тела запроса с записью файлов на диск по частям."""
+        request = parser_context['request']
+        request.upload_handlers = [StreamingImageUploadHandler(request)]
+        return super().parse(stream, media_type, parser_context)
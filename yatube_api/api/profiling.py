@@ -0,0 +1,222 @@
+"""Профилирование запросов: этапы обработки, SQL и заголовок Server-Timing."""
+
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+import json
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+
+
+logger = logging.getLogger('api.profiling')
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+class Profile:
+    """Время этапов обработки одного запроса."""
+
+    def __init__(self):
+        """Пустой профиль, отсчёт времени начинается сразу."""
+        self.start = perf_counter()
+        self.total = None
+        self.timings = defaultdict(float)
+        self.active = set()
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+    @contextmanager
+    def span(self, name):
+        """Учёт времени этапа; вложенный этап с тем же именем не считается."""
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += perf_counter() - start
+            self.active.discard(name)
+
+    def finish(self):
+        """Фиксация общего времени запроса."""
+        self.total = perf_counter() - self.start
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing в миллисекундах."""
+        metrics = [
+            f'{name};dur={seconds * 1000:.3f}'
+            for name, seconds in self.timings.items()
+        ]
+        metrics.append(
+            f'sql;dur={self.sql_time * 1000:.3f};'
+            f'desc="{self.sql_count} queries"'
+        )
+        metrics.append(f'total;dur={self.total * 1000:.3f}')
+        return ', '.join(metrics)
+
+    def as_dict(self, request, response):
+        """Запись профиля для журнала."""
+        match = request.resolver_match
+        return {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'route': match.url_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(self.total * 1000, 3),
+            'timings_ms': {
+                name: round(seconds * 1000, 3)
+                for name, seconds in self.timings.items()
+            },
+            'sql_count': self.sql_count,
+            'sql_ms': round(self.sql_time * 1000, 3),
+        }
+
+
+def span(name):
+    """Этап профиля текущего запроса или пустой контекст без профилирования."""
+    profile = current_profile.get()
+    if profile is None:
+        return nullcontext()
+    return profile.span(name)
+
+
+def record_sql(execute, sql, params, many, context):
+    """Учёт числа и длительности SQL-запросов в профиле текущего запроса."""
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.sql_count += 1
+        profile.sql_time += perf_counter() - start
+
+
+def install_sql_recorder(sender=None, connection=None, **kwargs):
+    """Подключение учёта SQL к соединению с базой данных."""
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class ProfilingMiddleware:
+    """Профилирование запросов, включаемое настройкой PROFILING_ENABLED."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Отключение промежуточного слоя, если профилирование не включено."""
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Под ASGI цепочка остаётся асинхронной, без общего потока.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        connection_created.connect(install_sql_recorder)
+
+    def __call__(self, request):
+        """Профиль запроса в заголовке ответа и в журнале."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        profile, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(profile, request, response)
+
+    async def __acall__(self, request):
+        """Асинхронный вариант обработки запроса."""
+        profile, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(profile, request, response)
+
+    def start(self):
+        """Новый профиль текущего запроса."""
+        # Соединения, открытые до подключения сигнала, получают учёт SQL
+        # при первом запросе в своём потоке.
+        for connection in connections.all():
+            install_sql_recorder(connection=connection)
+        profile = Profile()
+        return profile, current_profile.set(profile)
+
+    def finish(self, profile, request, response):
+        """Запись профиля в заголовок ответа и в журнал."""
+        profile.finish()
+        response['Server-Timing'] = profile.server_timing()
+        logger.info(json.dumps(
+            profile.as_dict(request, response), ensure_ascii=False
+        ))
+        return response
+
+    def process_template_response(self, request, response):
+        """Учёт времени отрисовки ответа после выхода из представления."""
+        profile = current_profile.get()
+        if profile is not None:
+            start = perf_counter()
+
+            def rendered(response):
+                profile.timings['render'] += perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ProfiledViewMixin:
+    """Миксин для учёта этапов обработки запроса представлением."""
+
+    def perform_authentication(self, request):
+        """Аутентификация с учётом времени."""
+        with span('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        """Проверка прав доступа с учётом времени."""
+        with span('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        """Проверка прав доступа к объекту с учётом времени."""
+        with span('permissions'):
+            super().check_object_permissions(request, obj)
+
+    def get_object(self):
+        """Загрузка объекта с учётом времени."""
+        with span('queryset'):
+            return super().get_object()
+
+    def paginate_queryset(self, queryset):
+        """Загрузка страницы записей с учётом времени."""
+        with span('queryset'):
+            return super().paginate_queryset(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        """Сериализатор, получающий уже загруженный список записей."""
+        if args and isinstance(args[0], QuerySet):
+            with span('queryset'):
+                args = (list(args[0]), *args[1:])
+        return super().get_serializer(*args, **kwargs)
+
+
+class ProfiledSerializerMixin:
+    """Миксин для учёта времени преобразования записей в данные ответа."""
+
+    def to_representation(self, instance):
+        """Преобразование записи с учётом времени."""
+        with span('serialize'):
+            return super().to_representation(instance)
@@ -0,0 +1,63 @@
+"""Рендереры ответов для приложения API."""
+
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def ndjson_line(data):
+    """Объект в виде одной строки NDJSON."""
+    return (
+        json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n'
+    ).encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Рендерер ответа в формате NDJSON."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Ответ из одного объекта в виде строки NDJSON."""
+        if data is None:
+            return b''
+        return ndjson_line(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Рендерер JSON на orjson с тем же результатом, что у JSONRenderer.
+
+    Без пакета orjson, а также для ответов с отступами работает как
+    обычный JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Данные ответа в виде байтов JSON."""
+        if (
+            orjson is None or data is None or self.ensure_ascii
+            or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data,
+            default=JSONEncoder().default,
+            option=(
+                orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        )
+        # Как и JSONRenderer, экранируем разделители строк, чтобы ответ
+        # оставался корректным кодом JavaScript.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,146 @@
+"""Чтение с реплик базы данных и закрепление за основной после записи."""
+
+import asyncio
+from contextvars import ContextVar
+import random
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import permissions
+
+
+PIN_COOKIE = 'primary_pin'
+
+current_state = ContextVar('replica_state', default=None)
+
+
+class ReplicaState:
+    """Выбор базы данных для запросов чтения текущего HTTP-запроса."""
+
+    def __init__(self, pinned):
+        """Состояние запроса; закреплённый запрос читает основную базу."""
+        self.pinned = pinned
+        self.replica_read = False
+
+
+def get_pin_key(user_id):
+    """Ключ кэша с отметкой недавней записи пользователя."""
+    return f'replica_pin:{user_id}'
+
+
+def pin_user(user):
+    """Закрепление пользователя за основной базой на время из настроек."""
+    cache.set(get_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def read_from_replica():
+    """Читал ли текущий запрос данные с реплики."""
+    state = current_state.get()
+    return state is not None and state.replica_read
+
+
+def check_user_pin(user):
+    """Закрепление текущего запроса, если пользователь недавно писал."""
+    state = current_state.get()
+    if state is not None and not state.pinned:
+        state.pinned = bool(cache.get(get_pin_key(user.pk)))
+
+
+class ReplicaRouter:
+    """Маршрутизатор: запись в основную базу, чтение с реплик.
+
+    С реплик читают только безопасные HTTP-запросы, не закреплённые за
+    основной базой. Запросы вне HTTP-запроса, например из команд
+    управления, всегда идут в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Случайная реплика или основная база."""
+        state = current_state.get()
+        if state is None or state.pinned or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        state.replica_read = True
+        return random.choice(list(settings.DATABASE_REPLICAS))
+
+    def db_for_write(self, model, **hints):
+        """Запись всегда в основную базу."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики содержат те же данные, что и основная база."""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Миграции применяются только к основной базе."""
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaMiddleware:
+    """Закрепление за основной базой изменяющих запросов и их авторов.
+
+    После успешной записи клиент получает cookie, а пользователь — отметку
+    в кэше на REPLICA_PIN_SECONDS секунд: пока они действуют, его запросы
+    чтения идут в основную базу и видят только что записанные данные.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Отключение промежуточного слоя, если реплики не настроены."""
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Под ASGI цепочка остаётся асинхронной, без общего потока.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        """Обработка запроса с выбором базы для чтения."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = current_state.set(self.get_state(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            current_state.reset(token)
+        if request.method not in permissions.SAFE_METHODS:
+            self.pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        """Асинхронный вариант обработки запроса."""
+        token = current_state.set(self.get_state(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_state.reset(token)
+        if request.method not in permissions.SAFE_METHODS:
+            # Ленивый пользователь Django может обратиться к сессии в базе.
+            await sync_to_async(self.pin_writer)(request, response)
+        return response
+
+    def get_state(self, request):
+        """Состояние запроса: изменяющие запросы читают основную базу."""
+        return ReplicaState(
+            pinned=(
+                request.method not in permissions.SAFE_METHODS
+                or PIN_COOKIE in request.COOKIES
+            )
+        )
+
+    def pin_writer(self, request, response):
+        """Закрепление клиента и пользователя после успешной записи."""
+        if response.status_code >= 400:
+            return
+        response.set_cookie(
+            PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+            httponly=True, samesite='Lax'
+        )
+        # После аутентификации DRF пользователь записан в запрос Django.
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            pin_user(user)
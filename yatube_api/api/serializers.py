@@ -5,27 +5,60 @@ from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 
 from posts.models import Comment, Follow, Group, Post
+from .profiling import ProfiledSerializerMixin
 
 
 User = get_user_model()
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(ProfiledSerializerMixin,
+                     serializers.ModelSerializer):
     """Сериализатор для модели Post."""
 
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
     )
+    image_thumbnail = serializers.SerializerMethodField()
+    image_webp = serializers.SerializerMethodField()
 
     class Meta:
         """Класс определяет метаданные для сериализатора PostSerializer."""
 
-        fields = ('id', 'text', 'pub_date', 'image', 'author', 'group')
+        fields = (
+            'id', 'text', 'pub_date', 'image', 'author', 'group',
+            'comments_count', 'image_thumbnail', 'image_webp'
+        )
         model = Post
-
-
-class CommentSerializer(serializers.ModelSerializer):
+        read_only_fields = ('comments_count',)
+
+    def update(self, instance, validated_data):
+        """Сохранение только переданных полей, без записи счётчиков."""
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=validated_data)
+        return instance
+
+    def get_image_thumbnail(self, obj):
+        """Адрес миниатюры или исходного изображения, пока её нет."""
+        return self.get_image_url(obj.image_thumbnail or obj.image)
+
+    def get_image_webp(self, obj):
+        """Адрес копии WebP или исходного изображения, пока её нет."""
+        return self.get_image_url(obj.image_webp or obj.image)
+
+    def get_image_url(self, image):
+        """Абсолютный адрес файла изображения."""
+        if not image:
+            return None
+        request = self.context.get('request')
+        if request is None:
+            return image.url
+        return request.build_absolute_uri(image.url)
+
+
+class CommentSerializer(ProfiledSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для модели Comment."""
 
     author = serializers.SlugRelatedField(
@@ -41,7 +74,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('post',)
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(ProfiledSerializerMixin,
+                      serializers.ModelSerializer):
     """Сериализатор для модели Group."""
 
     class Meta:
@@ -51,7 +85,8 @@ class GroupSerializer(serializers.ModelSerializer):
         model = Group
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(ProfiledSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для модели Follow."""
 
     user = serializers.SlugRelatedField(
@@ -84,3 +119,117 @@ class FollowSerializer(serializers.ModelSerializer):
                 'Нельзя подписаться на самого себя'
             )
         return value
+
+
+class UserSerializer(ProfiledSerializerMixin,
+                     serializers.ModelSerializer):
+    """Сериализатор пользователя со счётчиками подписок и постов."""
+
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+    posts_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        """Класс определяет метаданные для сериализатора UserSerializer."""
+
+        fields = (
+            'id', 'username', 'followers_count', 'following_count',
+            'posts_count'
+        )
+        model = User
+
+
+class ValuesSerializer:
+    """Представление записей списка по словарям из QuerySet.values().
+
+    Обходит поля DRF, но отдаёт те же данные, что и сериализатор модели
+    `serializer_class`, с полями из его Meta.fields. Поле берётся из
+    столбца с тем же именем или из `sources`, а если в подклассе есть
+    метод `get_<поле>(row)`, — из его результата.
+    """
+
+    serializer_class = None
+    sources = {}
+
+    def __init__(self, context=None):
+        """Сериализатор с контекстом запроса для абсолютных адресов."""
+        self.context = context or {}
+        self.datetime_field = serializers.DateTimeField()
+        meta = self.serializer_class.Meta
+        self.model = meta.model
+        self.getters = [
+            (
+                field, getattr(self, f'get_{field}', None),
+                self.sources.get(field, field)
+            )
+            for field in meta.fields
+        ]
+
+    def get_queryset(self, queryset):
+        """Выборка только нужных для ответа столбцов."""
+        return queryset.values(*(source for _, _, source in self.getters))
+
+    def to_representation(self, row):
+        """Данные ответа для одной записи."""
+        return {
+            field: getter(row) if getter else row[source]
+            for field, getter, source in self.getters
+        }
+
+    def many(self, rows):
+        """Данные ответа для списка записей."""
+        return [self.to_representation(row) for row in rows]
+
+    def format_datetime(self, value):
+        """Дата в том же формате, что у DateTimeField."""
+        return self.datetime_field.to_representation(value)
+
+    def get_file_url(self, field_name, name):
+        """Абсолютный адрес файла из поля модели."""
+        if not name:
+            return None
+        url = self.model._meta.get_field(field_name).storage.url(name)
+        request = self.context.get('request')
+        if request is None:
+            return url
+        return request.build_absolute_uri(url)
+
+
+class PostValuesSerializer(ValuesSerializer):
+    """Быстрое представление постов в формате PostSerializer."""
+
+    serializer_class = PostSerializer
+    sources = {'author': 'author__username'}
+
+    def get_pub_date(self, row):
+        """Дата публикации."""
+        return self.format_datetime(row['pub_date'])
+
+    def get_image(self, row):
+        """Адрес исходного изображения."""
+        return self.get_file_url('image', row['image'])
+
+    def get_image_thumbnail(self, row):
+        """Адрес миниатюры или исходного изображения, пока её нет."""
+        return (
+            self.get_file_url('image_thumbnail', row['image_thumbnail'])
+            or self.get_image(row)
+        )
+
+    def get_image_webp(self, row):
+        """Адрес копии WebP или исходного изображения, пока её нет."""
+        return (
+            self.get_file_url('image_webp', row['image_webp'])
+            or self.get_image(row)
+        )
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Быстрое представление комментариев в формате CommentSerializer."""
+
+    serializer_class = CommentSerializer
+    sources = {'author': 'author__username'}
+
+    def get_created(self, row):
+        """Дата создания."""
+        return self.format_datetime(row['created'])
@@ -0,0 +1,32 @@
+"""Обработчики сигналов для сброса кэша приложения API."""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Group
+from .cache import group_cache, user_cache
+
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Group)
+def group_changed(sender, instance, **kwargs):
+    """Сброс закэшированных ответов о группах после фиксации.
+
+    Сброс до фиксации позволил бы параллельному запросу сохранить
+    в кэш прежние данные под новой версией.
+    """
+    transaction.on_commit(group_cache.invalidate)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Сброс пользователя в кэше аутентификации.
+
+    Сбрасывается любое сохранение, в том числе смена пароля и отключение
+    учётной записи. Сброс выполняется после фиксации транзакции.
+    """
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
@@ -0,0 +1,238 @@
+"""Ограничение частоты запросов скользящим окном."""
+
+from functools import lru_cache
+import itertools
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from .metrics import registry
+
+
+class CacheThrottleStorage:
+    """Счётчики окон в кэше Django."""
+
+    def __init__(self, location=None):
+        """Хранилище в кэше по умолчанию; адрес не используется."""
+
+    def hit(self, key, window, duration, allow=None):
+        """Учёт запроса и счётчики текущего и предыдущего окон.
+
+        Счётчики возвращаются вместе с этим запросом, а учитывается он, только
+        если `allow(current, previous)` истинно или проверка не передана.
+        """
+        current_key = f'throttle:{key}:{window}'
+        cache.add(current_key, 0, duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            cache.set(current_key, 1, duration * 2)
+            current = 1
+        previous = cache.get(f'throttle:{key}:{window - 1}', 0)
+        if allow is not None and not allow(current, previous):
+            try:
+                cache.decr(current_key)
+            except ValueError:
+                pass
+        return current, previous
+
+    def clear(self):
+        """Сброс счётчиков вместе с кэшем."""
+        cache.clear()
+
+
+class SQLiteThrottleStorage:
+    """Счётчики окон в отдельном файле SQLite, общем для процессов.
+
+    Окна ключа, оставшиеся без запросов, удаляются общей очисткой раз
+    в `prune_interval` запросов по сроку действия счётчика.
+    """
+
+    prune_interval = 1000
+
+    def __init__(self, location):
+        """Хранилище в файле базы данных `location`."""
+        self.location = str(location)
+        self.local = threading.local()
+        self.hits = itertools.count(1)
+
+    def get_connection(self):
+        """Соединение текущего потока с созданной при необходимости схемой."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.location, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_window ('
+                'key TEXT NOT NULL, window INTEGER NOT NULL, '
+                'count INTEGER NOT NULL, expires INTEGER NOT NULL, '
+                'PRIMARY KEY (key, window)'
+                ') WITHOUT ROWID'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS throttle_window_expires '
+                'ON throttle_window (expires)'
+            )
+            self.local.connection = connection
+        return connection
+
+    def hit(self, key, window, duration, allow=None):
+        """Учёт запроса и счётчики текущего и предыдущего окон.
+
+        Счётчики возвращаются вместе с этим запросом, а учитывается он, только
+        если `allow(current, previous)` истинно или проверка не передана.
+        """
+        connection = self.get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            counts = dict(connection.execute(
+                'SELECT window, count FROM throttle_window '
+                'WHERE key = ? AND window IN (?, ?)',
+                (key, window, window - 1)
+            ).fetchall())
+            current = counts.get(window, 0) + 1
+            previous = counts.get(window - 1, 0)
+            if allow is None or allow(current, previous):
+                # Счётчик нужен, пока окно остаётся текущим или предыдущим.
+                connection.execute(
+                    'INSERT INTO throttle_window VALUES (?, ?, 1, ?) '
+                    'ON CONFLICT (key, window) DO UPDATE '
+                    'SET count = count + 1',
+                    (key, window, (window + 2) * duration)
+                )
+                if current == 1:
+                    # Первый запрос в новом окне: окна старше предыдущего
+                    # больше не нужны, и на ключ остаётся не больше двух строк.
+                    connection.execute(
+                        'DELETE FROM throttle_window '
+                        'WHERE key = ? AND window < ?',
+                        (key, window - 1)
+                    )
+            if next(self.hits) % self.prune_interval == 0:
+                connection.execute(
+                    'DELETE FROM throttle_window WHERE expires <= ?',
+                    (window * duration,)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return current, previous
+
+    def clear(self):
+        """Удаление всех счётчиков."""
+        self.get_connection().execute('DELETE FROM throttle_window')
+
+
+class RedisThrottleStorage:
+    """Счётчики окон в Redis."""
+
+    def __init__(self, location):
+        """Хранилище на сервере Redis по адресу `location`."""
+        import redis
+
+        self.client = redis.Redis.from_url(location)
+
+    def hit(self, key, window, duration, allow=None):
+        """Учёт запроса и счётчики текущего и предыдущего окон.
+
+        Счётчики возвращаются вместе с этим запросом, а учитывается он, только
+        если `allow(current, previous)` истинно или проверка не передана.
+        """
+        current_key = f'throttle:{key}:{window}'
+        pipeline = self.client.pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, duration * 2)
+        pipeline.get(f'throttle:{key}:{window - 1}')
+        current, _, previous = pipeline.execute()
+        previous = int(previous or 0)
+        if allow is not None and not allow(current, previous):
+            self.client.decr(current_key)
+        return current, previous
+
+    def clear(self):
+        """Удаление всех счётчиков."""
+        keys = list(self.client.scan_iter('throttle:*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+@lru_cache(maxsize=None)
+def get_throttle_storage():
+    """Хранилище счётчиков, выбранное в настройке THROTTLE_STORAGE."""
+    options = settings.THROTTLE_STORAGE
+    return import_string(options['BACKEND'])(options.get('LOCATION'))
+
+
+class SlidingWindowThrottleMixin:
+    """Ограничение частоты по счётчикам двух соседних окон.
+
+    Вместо истории отметок времени хранятся два числа на ключ, а число
+    запросов за последний период оценивается как счётчик текущего окна
+    плюс доля счётчика предыдущего, пропорциональная непрошедшей части
+    периода. Как и в SimpleRateThrottle, учитываются только пропущенные
+    запросы: клиент, повторяющий отклонённые запросы, не продлевает себе
+    блокировку.
+    """
+
+    def allow_request(self, request, view):
+        """Учёт запроса и проверка, не превышен ли лимит."""
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.elapsed = elapsed
+        weight = 1 - elapsed / self.duration
+
+        def allow(current, previous):
+            return previous * weight + current <= self.num_requests
+
+        self.current, self.previous = get_throttle_storage().hit(
+            self.key, int(window), self.duration, allow
+        )
+        if not allow(self.current, self.previous):
+            registry.inc('throttle_rejections_total', scope=self.scope)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        """Запрос пропущен."""
+        return True
+
+    def wait(self):
+        """Секунды до момента, когда следующий запрос будет пропущен."""
+        allowed = self.num_requests - 1
+        # Отклонённый запрос не учтён в счётчике текущего окна.
+        current = self.current - 1
+        if current <= allowed and self.previous:
+            return max(
+                0,
+                self.duration * (1 - (allowed - current) / self.previous)
+                - self.elapsed
+            )
+        return (
+            self.duration - self.elapsed
+            + self.duration * max(0, 1 - allowed / current)
+        )
+
+
+class SlidingWindowUserRateThrottle(
+    SlidingWindowThrottleMixin, UserRateThrottle
+):
+    """Ограничение частоты запросов пользователя скользящим окном."""
+
+
+class SlidingWindowAnonRateThrottle(
+    SlidingWindowThrottleMixin, AnonRateThrottle
+):
+    """Ограничение частоты анонимных запросов скользящим окном."""
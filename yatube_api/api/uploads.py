@@ -0,0 +1,88 @@
+"""Потоковая обработка загружаемых изображений."""
+
+from io import BytesIO
+import warnings
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+
+
+class StreamingImageUploadHandler(TemporaryFileUploadHandler):
+    """Запись загрузки на диск по частям с ранней проверкой изображения.
+
+    Размеры изображения читаются из заголовка файла, без декодирования
+    растра; загрузка прерывается, как только превышен лимит байтов или
+    пикселей.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        """Отказ до чтения тела, если запрос заведомо больше лимита."""
+        limit = (
+            settings.IMAGE_UPLOAD_MAX_BYTES
+            + settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        )
+        if content_length > limit:
+            raise ValidationError(
+                f'Размер запроса превышает {limit} байт.'
+            )
+
+    def new_file(self, field_name, *args, **kwargs):
+        """Подготовка счётчика и буфера заголовка для нового файла."""
+        super().new_file(field_name, *args, **kwargs)
+        self.received = 0
+        self.header = b''
+        self.header_checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        """Проверка очередного фрагмента и запись его во временный файл."""
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_BYTES:
+            self.reject(
+                'Размер файла превышает '
+                f'{settings.IMAGE_UPLOAD_MAX_BYTES} байт.'
+            )
+        if not self.header_checked:
+            self.check_header(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        """Отказ, если по файлу не удалось определить размеры."""
+        if not self.header_checked:
+            self.reject('Загрузите корректное изображение.')
+        return super().file_complete(file_size)
+
+    def check_header(self, raw_data):
+        """Чтение размеров изображения из заголовка файла."""
+        # Image.open читает только заголовок и не выделяет память под
+        # растр, поэтому копится лишь начало файла до первого успеха.
+        self.header += raw_data
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+                image = Image.open(BytesIO(self.header))
+        except Image.DecompressionBombError:
+            self.reject_pixels()
+        except (OSError, SyntaxError, ValueError):
+            if len(self.header) > settings.IMAGE_UPLOAD_HEADER_BYTES:
+                self.reject('Загрузите корректное изображение.')
+            return
+        self.header_checked = True
+        self.header = b''
+        width, height = image.size
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self.reject_pixels()
+
+    def reject_pixels(self):
+        """Ошибка слишком большого по числу пикселей изображения."""
+        self.reject(
+            'Изображение больше '
+            f'{settings.IMAGE_UPLOAD_MAX_PIXELS} пикселей.'
+        )
+
+    def reject(self, message):
+        """Удаление временного файла и ошибка валидации поля."""
+        self.file.close()
+        raise ValidationError({self.field_name: [message]})
@@ -1,13 +1,19 @@
 """Маршрутизатор для работы с API."""
 
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import async_read_urls
 from .views import (
     PostViewSet,
     CommentViewSet,
+    FeedViewSet,
     FollowViewSet,
-    GroupViewSet
+    GroupPostViewSet,
+    GroupViewSet,
+    PostExportView,
+    UserViewSet
 )
 
 
@@ -17,9 +23,21 @@ router_v1.register(r'posts/(?P<post_id>\d+)/comments',
                    CommentViewSet, basename='comments')
 router_v1.register('follow', FollowViewSet, basename='follow')
 router_v1.register('groups', GroupViewSet, basename='groups')
+router_v1.register(r'groups/(?P<slug>[-\w]+)/posts',
+                   GroupPostViewSet, basename='group-posts')
+router_v1.register('feed', FeedViewSet, basename='feed')
+router_v1.register('users', UserViewSet, basename='users')
 
 
 urlpatterns = [
-    path('v1/', include(router_v1.urls)),
+    path(
+        'v1/export/posts/',
+        PostExportView.as_view(),
+        name='posts-export'
+    ),
+    path(
+        'v1/',
+        include(async_read_urls(router_v1.urls, settings.ASYNC_READ_ROUTES))
+    ),
     path('v1/', include('djoser.urls.jwt'))
 ]
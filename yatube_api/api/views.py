@@ -1,92 +1,279 @@
 """Представления для работы с моделями приложения API."""
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import filters, permissions, viewsets
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework import filters, mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from posts.bulk import create_posts
+from posts.images import discard_variants, schedule_variants
 from posts.models import Comment, Follow, Group, Post
+from posts.timeline import get_feed
+from posts.versions import GROUPS, POSTS, bump_version, comments_key
+from .cache import group_cache
+from .export import export_posts
+from .filters import PostFilter, PostSearchFilter
+from .pagination import FeedPagination, PostPagination
+from .parsers import ImageMultiPartParser, NDJSONParser
 from .permissions import IsOwnerOrReadOnly
+from .profiling import ProfiledViewMixin
+from .renderers import NDJSONRenderer
 from .serializers import (
     CommentSerializer,
+    CommentValuesSerializer,
     FollowSerializer,
     GroupSerializer,
     PostSerializer,
-
+    PostValuesSerializer,
+    UserSerializer
+)
+from .viewsets import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    CreateListViewSet,
+    FastListMixin,
+    NestedResourceMixin
 )
-from .viewsets import CreateListViewSet
 
 
 User = get_user_model()
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ProfiledViewMixin,
+                  ConditionalGetMixin,
+                  FastListMixin,
+                  viewsets.ModelViewSet):
     """Представление для модели Post."""
 
-    queryset = Post.objects.all()
+    collection_key = POSTS
+    queryset = Post.objects.select_related('author').order_by('pub_date', 'id')
     serializer_class = PostSerializer
+    values_serializer_class = PostValuesSerializer
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly
     ]
-    pagination_class = LimitOffsetPagination
+    pagination_class = PostPagination
+    filter_backends = [PostFilter, PostSearchFilter]
+    parser_classes = [JSONParser, FormParser, ImageMultiPartParser]
 
     def perform_create(self, serializer):
         """Создание записи с указанием автора и группы."""
-        serializer.save(author=self.request.user)
+        # Счётчик постов автора обновляется сигналом в той же транзакции.
+        with transaction.atomic():
+            post = serializer.save(author=self.request.user)
+        schedule_variants(post)
+
+    def perform_update(self, serializer):
+        """Изменение записи с подготовкой копий нового изображения."""
+        if 'image' not in serializer.validated_data:
+            serializer.save()
+            return
+        discard_variants(serializer.instance)
+        post = serializer.save(image_thumbnail=None, image_webp=None)
+        schedule_variants(post)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        parser_classes=[JSONParser, NDJSONParser]
+    )
+    def bulk(self, request):
+        """Создание списка постов одним запросом."""
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Ожидается список постов.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(request.data) > settings.BULK_POSTS_MAX:
+            return Response(
+                {'detail': 'Слишком много постов в одном запросе, '
+                           f'максимум {settings.BULK_POSTS_MAX}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = self.get_serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        posts = create_posts(
+            [
+                Post(author=request.user, **item)
+                for item in serializer.validated_data
+            ],
+            settings.BULK_POSTS_CHUNK_SIZE
+        )
+        return Response(
+            self.get_serializer(posts, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ProfiledViewMixin,
+                     ConditionalGetMixin,
+                     FastListMixin,
+                     NestedResourceMixin,
+                     viewsets.ModelViewSet):
     """Представление для модели Comment."""
 
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('author').order_by(
+        'created', 'id'
+    )
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly
     ]
+    parent_queryset = Post.objects.all()
+    parent_lookup_kwarg = 'post_id'
+    parent_field = 'post_id'
 
-    def get_object_post(self):
-        """Функция для создания поста."""
-        return get_object_or_404(Post, id=self.kwargs.get('post_id'))
-
-    def get_queryset(self):
-        """Получение записи авторизированным пользователем."""
-        post = self.get_object_post()
-        return post.comments.all()
+    def get_collection_key(self):
+        """Ключ коллекции комментариев к посту из адреса запроса."""
+        return comments_key(self.kwargs.get('post_id'))
 
     def perform_create(self, serializer):
-        """Создание записи без указания номера поста и автора в запросе."""
-        post_id = self.kwargs.get('post_id')
-        self.get_object_post()
-        serializer.save(
-            author_id=self.request.user.id,
-            post_id=post_id
-        )
+        """Создание комментария без указания поста и автора в запросе."""
+        post_id = int(self.get_parent_id())
+        with transaction.atomic():
+            # Увеличение счётчика заодно проверяет, что пост существует.
+            if not Post.objects.filter(id=post_id).update(
+                comments_count=F('comments_count') + 1
+            ):
+                raise Http404
+            serializer.save(author=self.request.user, post_id=post_id)
+        bump_version(POSTS)
+
+    def perform_destroy(self, instance):
+        """Удаление комментария с уменьшением счётчика у поста."""
+        with transaction.atomic():
+            instance.delete()
+            Post.objects.filter(
+                id=instance.post_id, comments_count__gt=0
+            ).update(comments_count=F('comments_count') - 1)
+        bump_version(POSTS, comments_key(instance.post_id))
 
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+class GroupViewSet(ProfiledViewMixin,
+                   ConditionalGetMixin,
+                   CachedResponseMixin,
+                   viewsets.ReadOnlyModelViewSet):
     """Представление для модели Group."""
 
-    queryset = Group.objects.all()
+    collection_key = GROUPS
+    response_cache = group_cache
+    queryset = Group.objects.order_by('id')
     serializer_class = GroupSerializer
     permission_classes = [
         permissions.AllowAny
     ]
 
 
-class FollowViewSet(CreateListViewSet):
+class GroupPostViewSet(ProfiledViewMixin,
+                       ConditionalListMixin,
+                       FastListMixin,
+                       mixins.ListModelMixin,
+                       viewsets.GenericViewSet):
+    """Представление для постов одной группы."""
+
+    collection_key = POSTS
+    serializer_class = PostSerializer
+    values_serializer_class = PostValuesSerializer
+    permission_classes = [
+        permissions.AllowAny
+    ]
+    pagination_class = PostPagination
+    filter_backends = [PostFilter, PostSearchFilter]
+
+    def get_queryset(self):
+        """Посты группы по индексу (group, pub_date)."""
+        group = get_object_or_404(Group, slug=self.kwargs['slug'])
+        return Post.objects.select_related('author').filter(
+            group=group
+        ).order_by('pub_date', 'id')
+
+
+class FollowViewSet(ProfiledViewMixin, CreateListViewSet):
     """Представление для модели Follow."""
 
-    queryset = Follow.objects.all()
+    queryset = Follow.objects.select_related('user', 'following')
     serializer_class = FollowSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ('following__username',)
 
     def perform_create(self, serializer):
-        """Создание записи без указания номера поста и автора в запросе."""
-        serializer.save(user=self.request.user)
+        """Создание подписки вместе с обновлением счётчиков."""
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
 
     def get_queryset(self):
         """Получение записи по фильтру."""
-        return self.request.user.follower.all()
+        return self.request.user.follower.select_related(
+            'user', 'following'
+        ).order_by('following_id')
+
+
+class UserViewSet(ProfiledViewMixin,
+                  mixins.RetrieveModelMixin,
+                  viewsets.GenericViewSet):
+    """Представление для счётчиков пользователя."""
+
+    queryset = User.objects.annotate(
+        followers_count=Coalesce('stats__followers_count', 0),
+        following_count=Coalesce('stats__following_count', 0),
+        posts_count=Coalesce('stats__posts_count', 0)
+    )
+    serializer_class = UserSerializer
+    permission_classes = [
+        permissions.AllowAny
+    ]
+    lookup_field = 'username'
+    lookup_value_regex = r'[\w.@+-]+'
+
+
+class FeedViewSet(ProfiledViewMixin,
+                  mixins.ListModelMixin,
+                  viewsets.GenericViewSet):
+    """Представление для ленты подписок пользователя."""
+
+    serializer_class = PostSerializer
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        """Получение постов авторов, на которых подписан пользователь."""
+        entries, posts = get_feed(self.request.user)
+        return (
+            entries.select_related('post__author'),
+            posts.select_related('author')
+        )
+
+
+class PostExportView(ProfiledViewMixin, APIView):
+    """Представление для потоковой выгрузки постов с комментариями."""
+
+    renderer_classes = [NDJSONRenderer, JSONRenderer]
+
+    def get(self, request):
+        """Выгрузка постов в формате NDJSON с фильтрами из запроса."""
+        queryset = PostFilter().filter_queryset(
+            request, Post.objects.select_related('author'), self
+        )
+        return StreamingHttpResponse(
+            export_posts(
+                queryset,
+                settings.EXPORT_CHUNK_SIZE,
+                context={'request': request}
+            ),
+            content_type=NDJSONRenderer.media_type
+        )
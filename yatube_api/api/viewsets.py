@@ -1,6 +1,19 @@
 """Модуль для отдельных миксинов."""
 
+from hashlib import sha1
+
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework import viewsets, mixins
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from posts.versions import get_version
+from .profiling import span
+from .renderers import FastJSONRenderer
+from .replicas import read_from_replica
 
 
 class CreateListViewSet(mixins.CreateModelMixin,
@@ -9,3 +22,157 @@ class CreateListViewSet(mixins.CreateModelMixin,
     """Миксины для представлений."""
 
     pass
+
+
+class NestedResourceMixin:
+    """Миксин для вложенных маршрутов вида `/<родитель>/<id>/<записи>/`.
+
+    Записи выбираются с условием на id родителя из адреса, а сам родитель
+    не загружается. Найденная запись или непустая страница списка уже
+    доказывают, что он существует; отдельная проверка выполняется только
+    для пустой страницы и не больше одного раза за запрос.
+    """
+
+    parent_queryset = None
+    parent_lookup_kwarg = None
+    parent_field = None
+
+    def get_parent_id(self):
+        """Id родительской записи из адреса запроса."""
+        return self.kwargs[self.parent_lookup_kwarg]
+
+    def check_parent(self):
+        """Ошибка 404, если родительской записи нет."""
+        exists = getattr(self, '_parent_exists', None)
+        if exists is None:
+            exists = self._parent_exists = self.parent_queryset.filter(
+                pk=self.get_parent_id()
+            ).exists()
+        if not exists:
+            raise Http404
+
+    def get_queryset(self):
+        """Записи родителя из адреса запроса."""
+        return super().get_queryset().filter(
+            **{self.parent_field: self.get_parent_id()}
+        )
+
+    def paginate_queryset(self, queryset):
+        """Страница записей; пустая страница требует проверки родителя."""
+        page = super().paginate_queryset(queryset)
+        if page is not None and not page:
+            self.check_parent()
+        return page
+
+
+class ConditionalListMixin:
+    """Миксин для ответа 304 на запрос списка по версии коллекции."""
+
+    collection_key = None
+
+    def get_collection_key(self):
+        """Ключ коллекции, которую отдаёт представление."""
+        return self.collection_key
+
+    def list(self, request, *args, **kwargs):
+        """Список записей с поддержкой условного запроса."""
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Ответ 304 без сериализации, если версия коллекции не менялась."""
+        key = self.get_collection_key()
+        version = get_version(key)
+        etag = quote_etag(sha1(
+            f'{key}:{version}:{request.get_full_path()}:'
+            f'{request.accepted_media_type}'.encode()
+        ).hexdigest())
+        # Без Last-Modified: при точности в секунду изменение в ту же
+        # секунду, что и предыдущий ответ, дало бы устаревший ответ 304.
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    """Миксин для ответа 304 по версии коллекции записей."""
+
+    def retrieve(self, request, *args, **kwargs):
+        """Запись с поддержкой условного запроса."""
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin:
+    """Миксин для выдачи ответов из версионного кэша."""
+
+    response_cache = None
+
+    def list(self, request, *args, **kwargs):
+        """Список записей из кэша или из базы данных."""
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Запись из кэша или из базы данных."""
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Ответ из кэша с сохранением успешных ответов после промаха."""
+        cached = self.response_cache.get(request)
+        if cached is not None:
+            data, link = cached
+            response = Response(data)
+            if link is not None:
+                response['Link'] = link
+            response['X-Cache'] = 'HIT'
+            return response
+        response = handler(request, *args, **kwargs)
+        # Версия кэша уже новая, а реплика может ещё отдавать старые данные.
+        if response.status_code == 200 and not read_from_replica():
+            self.response_cache.set(
+                request, (response.data, response.get('Link'))
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class FastListMixin:
+    """Миксин для быстрого списка записей без сериализаторов DRF."""
+
+    values_serializer_class = None
+
+    def use_fast_list(self, request):
+        """Быстрый путь включён настройкой и запрошен ответ в JSON."""
+        return (
+            settings.FAST_LIST_SERIALIZATION
+            and type(request.accepted_renderer) is JSONRenderer
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Список записей из словарей QuerySet.values()."""
+        if not self.use_fast_list(request):
+            return super().list(request, *args, **kwargs)
+        request.accepted_renderer = FastJSONRenderer()
+        serializer = self.values_serializer_class(
+            context=self.get_serializer_context()
+        )
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with span('serialize'):
+                data = serializer.many(page)
+            return self.get_paginated_response(data)
+        with span('queryset'):
+            rows = list(queryset)
+        with span('serialize'):
+            data = serializer.many(rows)
+        return Response(data)
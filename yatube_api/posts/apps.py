@@ -1,9 +1,24 @@
 """Создание нового приложения."""
 
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """Восстановление триггеров поискового индекса после миграций."""
+    from .search import ensure_triggers
+
+    ensure_triggers(connections[using])
 
 
 class PostsConfig(AppConfig):
     """Класс для создания нового приложения."""
 
     name = 'posts'
+
+    def ready(self):
+        """Подключение обработчиков сигналов."""
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(restore_search_triggers, sender=self)
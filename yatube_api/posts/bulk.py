@@ -0,0 +1,36 @@
+"""Массовое создание постов."""
+
+from collections import Counter
+
+from django.db import connection, transaction
+
+from . import stats, timeline
+from .models import Post
+from .versions import POSTS, bump_version
+
+
+def assign_ids(posts):
+    """Проставление id постам, если база их не возвращает после вставки."""
+    # SQLite не возвращает id из bulk_create, но держит блокировку записи
+    # до конца транзакции, поэтому последние id принадлежат этой вставке.
+    ids = Post.objects.order_by('-id').values_list('id', flat=True)
+    for post, post_id in zip(posts, reversed(ids[:len(posts)])):
+        post.id = post_id
+
+
+def create_posts(posts, chunk_size):
+    """Вставка постов порциями, каждая порция в своей транзакции."""
+    for start in range(0, len(posts), chunk_size):
+        chunk = posts[start:start + chunk_size]
+        with transaction.atomic():
+            Post.objects.bulk_create(chunk)
+            if not connection.features.can_return_rows_from_bulk_insert:
+                assign_ids(chunk)
+            timeline.fan_out(chunk)
+            for author_id, count in Counter(
+                post.author_id for post in chunk
+            ).items():
+                stats.increment(author_id, 'posts_count', count)
+    if posts:
+        bump_version(POSTS)
+    return posts
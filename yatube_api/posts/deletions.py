@@ -0,0 +1,68 @@
+"""Учёт удалений, накопленный до фиксации транзакции.
+
+Каскадное удаление присылает сигнал на каждую запись. Обработчики не
+меняют счётчики и версии сразу, а копят изменения в пакете транзакции;
+после фиксации пакет применяется одним UPDATE на пользователя и
+несколькими запросами к версиям коллекций. Счётчики пользователей,
+удалённых в той же транзакции, не обновляются: их строки удаляются
+вместе с ними.
+"""
+
+from collections import Counter, defaultdict
+import threading
+
+from django.db import connections, transaction
+
+from . import stats, timeline
+from .versions import bump_versions
+
+_local = threading.local()
+
+
+class DeletionBatch:
+    """Изменения счётчиков и версий после удалений в одной транзакции."""
+
+    def __init__(self, using):
+        """Пустой пакет для базы данных `using`."""
+        self.using = using
+        self.decrements = defaultdict(Counter)
+        self.version_keys = set()
+        self.deleted_users = set()
+        self.scheduled = False
+        self.flushed = False
+
+    def decrement(self, user_id, field):
+        """Уменьшение счётчика пользователя на единицу."""
+        self.decrements[user_id][field] += 1
+
+    def schedule(self):
+        """Применение пакета после фиксации транзакции."""
+        if not self.scheduled:
+            self.scheduled = True
+            transaction.on_commit(self.flush, using=self.using)
+
+    def flush(self):
+        """Запись накопленных изменений."""
+        self.flushed = True
+        dropped = {}
+        for user_id, amounts in self.decrements.items():
+            if user_id not in self.deleted_users:
+                stats.decrement(user_id, amounts)
+                if amounts['followers_count']:
+                    dropped[user_id] = amounts['followers_count']
+        if dropped:
+            timeline.restore_fan_out(dropped)
+        bump_versions(self.version_keys)
+
+
+def get_batch(using):
+    """Пакет изменений текущей транзакции базы данных `using`."""
+    batches = _local.__dict__.setdefault('batches', {})
+    batch = batches.get(using)
+    # После отката Django забывает обработчики on_commit, и пакет
+    # отброшенной транзакции больше не используется.
+    if batch is None or batch.flushed or not any(
+        func == batch.flush for _, func in connections[using].run_on_commit
+    ):
+        batch = batches[using] = DeletionBatch(using)
+    return batch
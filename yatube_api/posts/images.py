@@ -0,0 +1,127 @@
+"""Фоновая подготовка уменьшенных копий изображений постов."""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO
+from threading import Lock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image
+
+from .models import Post
+from .versions import POSTS, bump_version
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = Lock()
+_pending = set()
+
+
+def get_executor():
+    """Общий пул потоков для подготовки копий изображений."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANT_WORKERS,
+                thread_name_prefix='image-variants'
+            )
+    return _executor
+
+
+def schedule_variants(post):
+    """Постановка подготовки копий в очередь после фиксации транзакции."""
+    if post.image:
+        transaction.on_commit(
+            lambda: submit_variants(post.pk, post.image.name)
+        )
+
+
+def discard_variants(post):
+    """Удаление файлов копий прежнего изображения после фиксации."""
+    names = [
+        variant.name for variant in (post.image_thumbnail, post.image_webp)
+        if variant
+    ]
+    if names:
+        transaction.on_commit(lambda: delete_files(names))
+
+
+def delete_files(names):
+    """Удаление файлов копий из хранилища."""
+    storage = Post._meta.get_field('image_thumbnail').storage
+    for name in names:
+        storage.delete(name)
+
+
+def submit_variants(post_id, name):
+    """Отправка подготовки копий изображения в пул потоков."""
+    future = get_executor().submit(build_variants, post_id, name)
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+    return future
+
+
+def wait_pending(timeout=None):
+    """Ожидание завершения поставленных в очередь задач."""
+    wait(list(_pending), timeout=timeout)
+
+
+def encode(image, image_format, **options):
+    """Изображение, сохранённое в памяти в заданном формате."""
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def flatten(image):
+    """Изображение без прозрачности на белом фоне для сохранения в JPEG."""
+    if image.mode != 'RGBA':
+        return image.convert('RGB')
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def build_variants(post_id, name):
+    """Подготовка миниатюры и копии WebP для изображения поста."""
+    try:
+        field = Post._meta.get_field('image_thumbnail')
+        stem = os.path.splitext(os.path.basename(name))[0]
+        with Post._meta.get_field('image').storage.open(name) as source:
+            image = Image.open(source)
+            image.load()
+        # Прозрачность палитры и цветового ключа задаётся в `info`, а не
+        # отдельным каналом, и при переводе в RGB теряется.
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        mode = 'RGBA' if has_alpha else 'RGB'
+        if image.mode != mode:
+            image = image.convert(mode)
+        webp = field.storage.save(
+            field.generate_filename(None, f'{stem}.webp'),
+            encode(image, 'WEBP', quality=settings.IMAGE_WEBP_QUALITY)
+        )
+        image.thumbnail(settings.IMAGE_THUMBNAIL_SIZE)
+        thumbnail = field.storage.save(
+            field.generate_filename(None, f'{stem}_thumb.jpg'),
+            encode(flatten(image), 'JPEG', quality=85)
+        )
+        updated = Post.objects.filter(id=post_id, image=name).update(
+            image_thumbnail=thumbnail, image_webp=webp
+        )
+        if updated:
+            bump_version(POSTS)
+        else:
+            # Изображение успели заменить, копии больше не нужны.
+            delete_files((thumbnail, webp))
+    except Exception:
+        logger.exception(
+            'Не удалось подготовить копии изображения %s поста %s',
+            name, post_id
+        )
+    finally:
+        close_old_connections()
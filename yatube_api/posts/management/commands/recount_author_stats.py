@@ -0,0 +1,60 @@
+"""Команда для пересчёта счётчиков подписок и постов пользователей."""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Q
+
+from posts.stats import count_subqueries, repair
+
+BATCH_SIZE = 500
+
+FIELDS = ('followers_count', 'following_count', 'posts_count')
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Команда для сверки и исправления счётчиков пользователей."""
+
+    help = (
+        'Пересчитывает счётчики подписчиков, подписок и постов '
+        'пользователей и сообщает о расхождениях'
+    )
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        """Поиск пользователей с расхождением и пересчёт их счётчиков."""
+        actual = {
+            f'actual_{field}': value
+            for field, value in count_subqueries(OuterRef('pk')).items()
+        }
+        condition = Q(stats__isnull=True)
+        for field in FIELDS:
+            condition |= ~Q(**{f'stats__{field}': F(f'actual_{field}')})
+        drifted = list(
+            User.objects.annotate(**actual).filter(condition).values_list(
+                'id', 'username',
+                *(f'stats__{field}' for field in FIELDS),
+                *actual
+            ).order_by('id')
+        )
+        for user_id, username, *values in drifted:
+            stored, counted = values[:len(FIELDS)], values[len(FIELDS):]
+            self.stdout.write(
+                f'{username}: {tuple(stored)} -> {tuple(counted)}'
+            )
+        self.stdout.write(f'Расхождений: {len(drifted)}')
+        if options['dry_run'] or not drifted:
+            return
+
+        ids = [user_id for user_id, *_ in drifted]
+        for start in range(0, len(ids), BATCH_SIZE):
+            repair(ids[start:start + BATCH_SIZE])
+        self.stdout.write(self.style.SUCCESS('Счётчики исправлены'))
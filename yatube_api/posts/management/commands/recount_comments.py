@@ -0,0 +1,51 @@
+"""Команда для пересчёта числа комментариев у постов."""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Comment, Post
+from posts.versions import POSTS, bump_version
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """Команда для сверки и исправления счётчиков комментариев."""
+
+    help = 'Пересчитывает Post.comments_count и сообщает о расхождениях'
+
+    def add_arguments(self, parser):
+        """Аргументы командной строки."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их',
+        )
+
+    def handle(self, *args, **options):
+        """Поиск постов с расхождением и пересчёт их счётчиков."""
+        drifted = list(
+            Post.objects.annotate(actual=Count('comments'))
+            .exclude(comments_count=F('actual'))
+            .values_list('id', 'comments_count', 'actual')
+        )
+        for post_id, stored, actual in drifted:
+            self.stdout.write(f'Пост {post_id}: {stored} -> {actual}')
+        self.stdout.write(f'Расхождений: {len(drifted)}')
+        if options['dry_run'] or not drifted:
+            return
+
+        actual_count = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .values('post')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        ids = [post_id for post_id, _, _ in drifted]
+        for start in range(0, len(ids), BATCH_SIZE):
+            Post.objects.filter(id__in=ids[start:start + BATCH_SIZE]).update(
+                comments_count=Coalesce(Subquery(actual_count), 0)
+            )
+        bump_version(POSTS)
+        self.stdout.write(self.style.SUCCESS('Счётчики исправлены'))
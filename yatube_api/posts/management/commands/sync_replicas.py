@@ -0,0 +1,39 @@
+"""Команда для копирования основной базы SQLite в файлы реплик."""
+
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """Команда для обновления локальных реплик SQLite."""
+
+    help = (
+        'Копирует основную базу SQLite в файлы реплик из DB_REPLICAS; '
+        'реплики PostgreSQL обновляются репликацией сервера'
+    )
+
+    def handle(self, *args, **options):
+        """Снимок основной базы в каждый файл реплики."""
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError(
+                'Команда нужна только для реплик SQLite.'
+            )
+        if not settings.DATABASE_REPLICAS:
+            self.stdout.write('Реплики не настроены')
+            return
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            try:
+                # Резервное копирование SQLite даёт согласованный снимок
+                # даже при одновременной записи в основную базу.
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'{alias}: обновлена')
+        self.stdout.write(self.style.SUCCESS('Реплики обновлены'))
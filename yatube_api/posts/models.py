@@ -24,15 +24,41 @@ class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
     author = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name='posts')
+        User, on_delete=models.CASCADE, related_name='posts',
+        db_index=False)
     group = models.ForeignKey(
         Group, on_delete=models.SET_NULL,
         blank=True,
         null=True,
-        related_name='posts'
+        related_name='posts',
+        db_index=False
     )
     image = models.ImageField(
         upload_to='posts/', null=True, blank=True)
+    image_thumbnail = models.ImageField(
+        upload_to='posts/variants/', null=True, blank=True)
+    image_webp = models.ImageField(
+        upload_to='posts/variants/', null=True, blank=True)
+    comments_count = models.PositiveIntegerField(
+        'Число комментариев', default=0)
+
+    class Meta:
+        """Класс определяет метаданные для модели Post."""
+
+        indexes = [
+            models.Index(
+                fields=['pub_date', 'id'],
+                name='post_pub_date_id_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['group', 'pub_date'],
+                name='post_group_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         """Функция для описания класса."""
@@ -45,11 +71,22 @@ class Comment(models.Model):
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='comments')
     post = models.ForeignKey(
-        Post, on_delete=models.CASCADE, related_name='comments')
+        Post, on_delete=models.CASCADE, related_name='comments',
+        db_index=False)
     text = models.TextField()
     created = models.DateTimeField(
         'Дата добавления', auto_now_add=True, db_index=True)
 
+    class Meta:
+        """Класс определяет метаданные для модели Comment."""
+
+        indexes = [
+            models.Index(
+                fields=['post', 'created'],
+                name='comment_post_created_idx'
+            ),
+        ]
+
     def __str__(self):
         """Функция для описания класса."""
         return self.text
@@ -66,12 +103,20 @@ class Follow(models.Model):
     )
     user = models.ForeignKey(
         User, on_delete=models.CASCADE,
-        related_name='follower'
+        related_name='follower',
+        db_index=False
     )
 
     class Meta:
         """Класс определяет метаданные для модели Follow."""
 
+        indexes = [
+            models.Index(
+                fields=['user', 'following'],
+                name='follow_user_following_idx'
+            ),
+        ]
+
         constraints = [
             models.CheckConstraint(
                 name='%(app_label)s_%(class)s_prevent_self_follow',
@@ -82,3 +127,65 @@ class Follow(models.Model):
                 name='%(app_label)s_%(class)s_unique_relationships'
             )
         ]
+
+
+class TimelineEntry(models.Model):
+    """Класс для записи ленты подписок пользователя."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE,
+        related_name='timeline'
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE,
+        related_name='timeline_entries'
+    )
+    pub_date = models.DateTimeField('Дата публикации')
+
+    class Meta:
+        """Класс определяет метаданные для модели TimelineEntry."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='%(app_label)s_%(class)s_unique_entries'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', 'pub_date', 'post'],
+                name='timeline_user_pub_date_idx'
+            ),
+        ]
+
+
+class CollectionVersion(models.Model):
+    """Класс для учёта версий коллекций записей."""
+
+    key = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self):
+        """Функция для описания класса."""
+        return f'{self.key}: {self.version}'
+
+
+class AuthorStats(models.Model):
+    """Класс для хранения счётчиков подписок и постов пользователя."""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    followers_count = models.PositiveIntegerField(
+        'Число подписчиков', default=0)
+    following_count = models.PositiveIntegerField(
+        'Число подписок', default=0)
+    posts_count = models.PositiveIntegerField(
+        'Число постов', default=0)
+
+    def __str__(self):
+        """Функция для описания класса."""
+        return f'{self.user_id}: {self.posts_count}'
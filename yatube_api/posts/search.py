@@ -0,0 +1,128 @@
+"""Полнотекстовый поиск по тексту постов."""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = 'posts_post_fts'
+POSTGRES_CONFIG = 'russian'
+
+SQLITE_INSTALL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"text, content='posts_post', content_rowid='id', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert "
+    f"AFTER INSERT ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete "
+    f"AFTER DELETE ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+    f"AFTER UPDATE OF text ON posts_post BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) "
+    f"VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+)
+SQLITE_UNINSTALL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+POSTGRES_VECTOR = f"to_tsvector('{POSTGRES_CONFIG}', posts_post.text)"
+POSTGRES_QUERY = f"websearch_to_tsquery('{POSTGRES_CONFIG}', %s)"
+POSTGRES_INSTALL = (
+    'CREATE INDEX IF NOT EXISTS post_text_search_idx ON posts_post '
+    f"USING GIN (to_tsvector('{POSTGRES_CONFIG}', text))",
+)
+POSTGRES_UNINSTALL = ('DROP INDEX IF EXISTS post_text_search_idx',)
+
+
+def install(connection, rebuild=False):
+    """Создание поискового индекса и триггеров, если их ещё нет."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for sql in SQLITE_INSTALL:
+                cursor.execute(sql)
+            if rebuild:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                )
+        elif connection.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+
+
+def ensure_triggers(connection):
+    """Восстановление триггеров SQLite после пересоздания таблицы постов.
+
+    Миграции SQLite меняют схему копированием таблицы, и триггеры старой
+    таблицы при этом пропадают.
+    """
+    if (
+        connection.vendor == 'sqlite'
+        and FTS_TABLE in connection.introspection.table_names()
+    ):
+        install(connection)
+
+
+def uninstall(connection):
+    """Удаление поискового индекса."""
+    statements = {
+        'sqlite': SQLITE_UNINSTALL,
+        'postgresql': POSTGRES_UNINSTALL,
+    }.get(connection.vendor, ())
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def get_terms(query):
+    """Слова поискового запроса без служебных символов."""
+    return re.findall(r'\w+', query)
+
+
+def search_posts(queryset, query):
+    """Посты, подходящие под запрос, от более релевантных к менее.
+
+    В SQLite каждое слово ищется как префикс, в PostgreSQL запрос
+    разбирается функцией websearch_to_tsquery с морфологией русского языка.
+    Для остальных баз данных выполняется поиск подстрок без ранжирования.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        matched = RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match]
+        )
+        # Ранг доступен только в запросе с MATCH; подзапрос выполняется
+        # по rowid лишь для найденных постов.
+        rank = RawSQL(
+            f'(SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = {queryset.model._meta.db_table}.id)',
+            [match], output_field=FloatField()
+        )
+        return queryset.filter(id__in=matched).order_by(
+            rank, '-pub_date', '-id'
+        )
+    if vendor == 'postgresql':
+        rank = RawSQL(
+            f'ts_rank({POSTGRES_VECTOR}, {POSTGRES_QUERY})', [query],
+            output_field=FloatField()
+        )
+        return queryset.filter(RawSQL(
+            f'{POSTGRES_VECTOR} @@ {POSTGRES_QUERY}', [query],
+            output_field=BooleanField()
+        )).order_by(rank.desc(), '-pub_date', '-id')
+    condition = Q()
+    for term in terms:
+        condition &= Q(text__icontains=term)
+    return queryset.filter(condition).order_by('-pub_date', '-id')
@@ -0,0 +1,97 @@
+"""Обработчики сигналов моделей приложения posts."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import deletions, stats, timeline
+from .models import AuthorStats, Comment, Follow, Group, Post
+from .versions import GROUPS, POSTS, bump_version, comments_key
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, **kwargs):
+    """Новая версия ленты постов после сохранения поста."""
+    bump_version(POSTS)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, using, **kwargs):
+    """Новая версия ленты и комментариев и счётчик постов автора."""
+    batch = deletions.get_batch(using)
+    batch.version_keys.update((POSTS, comments_key(instance.pk)))
+    batch.decrement(instance.author_id, 'posts_count')
+    batch.schedule()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, **kwargs):
+    """Новая версия комментариев поста после сохранения комментария.
+
+    Обработчика post_delete нет: он отключил бы быстрое каскадное
+    удаление комментариев вместе с постом. Удаление комментария через API
+    увеличивает версию в представлении.
+    """
+    bump_version(comments_key(instance.post_id))
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    """Новая версия списка групп после сохранения группы."""
+    bump_version(GROUPS)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    """Новая версия групп и ленты: у постов обнулилась группа."""
+    bump_version(GROUPS, POSTS)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    """Рассылка нового поста в ленты подписчиков и счётчик постов автора."""
+    if created:
+        timeline.fan_out([instance])
+        stats.increment(instance.author_id, 'posts_count')
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    """Добавление постов автора в ленту нового подписчика и счётчики."""
+    if created:
+        timeline.backfill(instance)
+        stats.follow_created(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, using, **kwargs):
+    """Удаление постов автора из ленты бывшего подписчика и счётчики."""
+    batch = deletions.get_batch(using)
+    # Ленты и посты удаляемого пользователя уходят каскадом.
+    if not batch.deleted_users & {instance.user_id, instance.following_id}:
+        timeline.remove(instance)
+    batch.decrement(instance.following_id, 'followers_count')
+    batch.decrement(instance.user_id, 'following_count')
+    batch.schedule()
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, using, **kwargs):
+    """Удаление пользователя без построчного учёта его постов.
+
+    Строка счётчиков пользователя удаляется вместе с ним, поэтому
+    уменьшать её для каждого поста и подписки не нужно.
+    """
+    batch = deletions.get_batch(using)
+    batch.deleted_users.add(instance.pk)
+    batch.schedule()
+
+
+@receiver(post_save, sender=User)
+def user_created(sender, instance, created, **kwargs):
+    """Пустые счётчики нового пользователя."""
+    if created:
+        AuthorStats.objects.get_or_create(user=instance)
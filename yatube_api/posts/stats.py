@@ -0,0 +1,73 @@
+"""Счётчики подписчиков, подписок и постов пользователей."""
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import AuthorStats, Follow, Post
+
+
+def count_subqueries(user_ref):
+    """Фактические значения счётчиков для пользователя по ссылке."""
+    def count(queryset, field):
+        return Coalesce(Subquery(
+            queryset.filter(**{field: user_ref})
+            .values(field)
+            .annotate(count=Count('id'))
+            .values('count')
+        ), 0)
+
+    return {
+        'followers_count': count(Follow.objects.all(), 'following'),
+        'following_count': count(Follow.objects.all(), 'user'),
+        'posts_count': count(Post.objects.all(), 'author'),
+    }
+
+
+def count_actual(user_id):
+    """Фактические значения счётчиков пользователя."""
+    return {
+        'followers_count': Follow.objects.filter(following_id=user_id).count(),
+        'following_count': Follow.objects.filter(user_id=user_id).count(),
+        'posts_count': Post.objects.filter(author_id=user_id).count(),
+    }
+
+
+def increment(user_id, field, amount=1):
+    """Увеличение счётчика пользователя.
+
+    Если строки со счётчиками ещё нет, например у пользователя из
+    bulk_create, она создаётся сразу с фактическими значениями.
+    """
+    if not AuthorStats.objects.filter(user_id=user_id).update(
+        **{field: F(field) + amount}
+    ):
+        AuthorStats.objects.get_or_create(
+            user_id=user_id, defaults=count_actual(user_id)
+        )
+
+
+def decrement(user_id, amounts):
+    """Уменьшение счётчиков пользователя одним UPDATE, но не ниже нуля."""
+    # Строка не создаётся: при удалении пользователя каскадом она может
+    # быть уже удалена в той же транзакции.
+    AuthorStats.objects.filter(user_id=user_id).update(**{
+        field: Greatest(F(field) - amount, 0)
+        for field, amount in amounts.items()
+    })
+
+
+def follow_created(follow):
+    """Учёт новой подписки у обоих пользователей."""
+    increment(follow.following_id, 'followers_count')
+    increment(follow.user_id, 'following_count')
+
+
+def repair(user_ids):
+    """Запись фактических значений счётчиков для списка пользователей."""
+    AuthorStats.objects.bulk_create(
+        (AuthorStats(user_id=user_id) for user_id in user_ids),
+        ignore_conflicts=True
+    )
+    AuthorStats.objects.filter(user_id__in=user_ids).update(
+        **count_subqueries(OuterRef('user_id'))
+    )
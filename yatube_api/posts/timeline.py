@@ -0,0 +1,119 @@
+"""Лента подписок: рассылка постов при записи и дочитывание при чтении."""
+
+from django.conf import settings
+
+from .models import AuthorStats, Follow, Post, TimelineEntry
+
+
+def is_popular(author_id):
+    """Больше ли у автора подписчиков, чем порог рассылки.
+
+    Решение принимается по счётчику AuthorStats, как и при чтении ленты,
+    чтобы рассылка и дочитывание не расходились.
+    """
+    return AuthorStats.objects.filter(
+        user_id=author_id,
+        followers_count__gt=settings.FEED_FANOUT_LIMIT
+    ).exists()
+
+
+def get_follower_ids(author_id):
+    """Подписчики автора или None, если их больше порога рассылки."""
+    if is_popular(author_id):
+        return None
+    return list(
+        Follow.objects.filter(following_id=author_id)
+        .values_list('user_id', flat=True)
+    )
+
+
+def fan_out(posts):
+    """Добавление постов в ленты подписчиков их авторов."""
+    followers = {}
+    entries = []
+    for post in posts:
+        if post.author_id not in followers:
+            followers[post.author_id] = get_follower_ids(post.author_id)
+        entries.extend(
+            TimelineEntry(user_id=user_id, post=post, pub_date=post.pub_date)
+            for user_id in followers[post.author_id] or ()
+        )
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+def backfill(follow):
+    """Добавление последних постов автора в ленту нового подписчика."""
+    if get_follower_ids(follow.following_id) is None:
+        return
+    posts = Post.objects.filter(author_id=follow.following_id).order_by(
+        '-pub_date', '-id'
+    )[:settings.FEED_BACKFILL_SIZE]
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(user=follow.user, post=post, pub_date=post.pub_date)
+            for post in posts.only('id', 'pub_date')
+        ),
+        ignore_conflicts=True
+    )
+
+
+def restore_fan_out(dropped):
+    """Записи лент для авторов, переставших быть популярными.
+
+    Пока автор был популярен, его посты не рассылались и дочитывались при
+    чтении. После падения счётчика до порога их дочитывание прекращается,
+    поэтому подписчики получают последние посты автора в ленты.
+    `dropped` — на сколько уменьшились счётчики подписчиков авторов.
+    """
+    limit = settings.FEED_FANOUT_LIMIT
+    counts = AuthorStats.objects.filter(
+        user_id__in=dropped, followers_count__lte=limit
+    ).values_list('user_id', 'followers_count')
+    for author_id, count in counts:
+        if count + dropped[author_id] <= limit:
+            continue
+        posts = list(
+            Post.objects.filter(author_id=author_id)
+            .order_by('-pub_date', '-id')
+            .values_list('id', 'pub_date')[:settings.FEED_BACKFILL_SIZE]
+        )
+        follower_ids = Follow.objects.filter(
+            following_id=author_id
+        ).values_list('user_id', flat=True)
+        TimelineEntry.objects.bulk_create(
+            (
+                TimelineEntry(user_id=user_id, post_id=post_id,
+                              pub_date=pub_date)
+                for user_id in follower_ids
+                for post_id, pub_date in posts
+            ),
+            ignore_conflicts=True
+        )
+
+
+def remove(follow):
+    """Удаление постов автора из ленты бывшего подписчика."""
+    TimelineEntry.objects.filter(
+        user_id=follow.user_id, post__author_id=follow.following_id
+    ).delete()
+
+
+def get_popular_author_ids(user):
+    """Авторы из подписок пользователя, посты которых не рассылаются."""
+    return Follow.objects.filter(
+        user=user,
+        following__stats__followers_count__gt=settings.FEED_FANOUT_LIMIT
+    ).values('following_id')
+
+
+def get_feed(user):
+    """Записи ленты пользователя и посты популярных авторов.
+
+    Страница ленты собирается из двух выборок по индексам: записей
+    TimelineEntry по (user, pub_date, post) и постов популярных авторов
+    по (author, pub_date).
+    """
+    return (
+        TimelineEntry.objects.filter(user=user),
+        Post.objects.filter(author_id__in=get_popular_author_ids(user))
+    )
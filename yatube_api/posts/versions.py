@@ -0,0 +1,56 @@
+"""Версии коллекций записей для условных запросов."""
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CollectionVersion
+
+POSTS = 'posts'
+GROUPS = 'groups'
+
+
+def comments_key(post_id):
+    """Ключ коллекции комментариев к посту."""
+    return f'comments:{post_id}'
+
+
+def bump_version(*keys):
+    """Увеличение версий коллекций после изменения записей."""
+    for key in keys:
+        updated = CollectionVersion.objects.filter(key=key).update(
+            version=F('version') + 1, updated=timezone.now()
+        )
+        if not updated:
+            version, created = CollectionVersion.objects.get_or_create(
+                key=key, defaults={'version': 1}
+            )
+            if not created:
+                bump_version(key)
+
+
+def get_version(key):
+    """Текущая версия коллекции."""
+    version = CollectionVersion.objects.filter(key=key).values_list(
+        'version', flat=True
+    ).first()
+    return version or 0
+
+
+def bump_versions(keys, batch_size=500):
+    """Увеличение версий многих коллекций несколькими запросами.
+
+    Гонка при создании строки версии не обрабатывается, поэтому функция
+    подходит для коллекций, в которые параллельно не пишут, например
+    комментариев удалённых постов.
+    """
+    keys = list(keys)
+    now = timezone.now()
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
+        CollectionVersion.objects.filter(key__in=chunk).update(
+            version=F('version') + 1, updated=now
+        )
+        CollectionVersion.objects.bulk_create(
+            (CollectionVersion(key=key, version=1) for key in chunk),
+            ignore_conflicts=True
+        )
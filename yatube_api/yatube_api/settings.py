@@ -26,6 +26,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.profiling.ProfilingMiddleware',
+    'api.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,13 +61,159 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yatube_api.wsgi.application'
 
 
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+DATABASE_PROFILES = {
+    'sqlite': {
+        'ENGINE': 'yatube_api.sqlite3',
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+                'cache_size': -16000,
+                'temp_store': 'MEMORY',
+                'mmap_size': 128 * 1024 * 1024,
+            },
+        },
+    },
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('POSTGRES_DB', 'yatube'),
+        'USER': os.getenv('POSTGRES_USER', 'yatube'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', '127.0.0.1'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        # За PgBouncer в режиме транзакций серверные курсоры не работают.
+        'DISABLE_SERVER_SIDE_CURSORS': bool(os.getenv('DB_POOLER')),
+        'OPTIONS': {
+            'connect_timeout': 5,
+        },
+    },
+}
+
+DATABASE_PROFILE = os.getenv('DATABASE_PROFILE', 'sqlite')
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': DATABASE_PROFILES[DATABASE_PROFILE],
+}
+
+# Реплики: пути к файлам для SQLite или адреса серверов для PostgreSQL.
+# В тестах реплики указывают на тестовую основную базу.
+REPLICA_LOCATION_KEY = {'sqlite': 'NAME', 'postgresql': 'HOST'}
+DATABASE_REPLICAS = {
+    f'replica_{number}': {
+        **DATABASES['default'],
+        REPLICA_LOCATION_KEY[DATABASE_PROFILE]: location,
+        'TEST': {'MIRROR': 'default'},
     }
+    for number, location in enumerate(
+        location for location in os.getenv('DB_REPLICAS', '').split(',')
+        if location
+    )
+}
+DATABASES.update(DATABASE_REPLICAS)
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 10))
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', BASE_DIR / 'cache'),
+    },
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'locmem')],
+}
+
+THROTTLE_BACKENDS = {
+    'sqlite': {
+        'BACKEND': 'api.throttling.SQLiteThrottleStorage',
+        'LOCATION': os.getenv(
+            'THROTTLE_LOCATION', BASE_DIR / 'throttle.sqlite3'
+        ),
+    },
+    'cache': {
+        'BACKEND': 'api.throttling.CacheThrottleStorage',
+    },
+    'redis': {
+        'BACKEND': 'api.throttling.RedisThrottleStorage',
+        'LOCATION': os.getenv(
+            'THROTTLE_LOCATION', 'redis://127.0.0.1:6379/2'
+        ),
+    },
 }
 
+THROTTLE_STORAGE = THROTTLE_BACKENDS[os.getenv('THROTTLE_BACKEND', 'sqlite')]
+
+FEED_FANOUT_LIMIT = int(os.getenv('FEED_FANOUT_LIMIT', 1000))
+FEED_BACKFILL_SIZE = int(os.getenv('FEED_BACKFILL_SIZE', 100))
+
+BULK_POSTS_MAX = int(os.getenv('BULK_POSTS_MAX', 1000))
+BULK_POSTS_CHUNK_SIZE = int(os.getenv('BULK_POSTS_CHUNK_SIZE', 200))
+
+PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 100))
+
+FAST_LIST_SERIALIZATION = bool(os.getenv('FAST_LIST_SERIALIZATION'))
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 500))
+
+ASYNC_READ_ROUTES = [
+    name for name in os.getenv('ASYNC_READ_ROUTES', '').split(',') if name
+]
+
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', 2))
+IMAGE_THUMBNAIL_SIZE = (320, 320)
+IMAGE_WEBP_QUALITY = 80
+IMAGE_UPLOAD_MAX_BYTES = int(
+    os.getenv('IMAGE_UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+)
+IMAGE_UPLOAD_MAX_PIXELS = int(os.getenv('IMAGE_UPLOAD_MAX_PIXELS', 25_000_000))
+IMAGE_UPLOAD_HEADER_BYTES = 256 * 1024
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+METRICS_PREFIX = 'yatube'
+
+PROFILING_ENABLED = bool(os.getenv('PROFILING_ENABLED'))
+PROFILING_LOG = os.getenv('PROFILING_LOG', BASE_DIR / 'profiling.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'profiling': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': PROFILING_LOG,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'api.profiling': {
+            'handlers': ['profiling'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+GROUP_CACHE_TIMEOUT = int(os.getenv('GROUP_CACHE_TIMEOUT', 300))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 10000))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -98,11 +247,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
+    'DEFAULT_PAGINATION_CLASS': (
+        'api.pagination.BoundedLimitOffsetPagination'
+    ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.AnonRateThrottle',
+        'api.throttling.SlidingWindowUserRateThrottle',
+        'api.throttling.SlidingWindowAnonRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'user': '1000/day',
@@ -0,0 +1 @@
+"""Бэкенд SQLite с настройкой соединений для рабочей нагрузки."""
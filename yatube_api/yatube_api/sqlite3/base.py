@@ -0,0 +1,45 @@
+"""Бэкенд SQLite с PRAGMA-настройками и немедленными транзакциями."""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Соединение SQLite с настройками из OPTIONS.
+
+    Помимо параметров `sqlite3.connect` в OPTIONS понимаются ключи
+    `pragmas` — PRAGMA, выполняемые при открытии каждого соединения, и
+    `transaction_mode` — режим BEGIN для блоков `transaction.atomic`.
+    """
+
+    def get_connection_params(self):
+        """Параметры `sqlite3.connect` без собственных ключей бэкенда."""
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        mode = params.pop('transaction_mode', 'DEFERRED').upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Неизвестный режим транзакций SQLite: {mode}.'
+            )
+        self.transaction_mode = mode
+        return params
+
+    def get_new_connection(self, conn_params):
+        """Новое соединение с выполненными PRAGMA."""
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        """Начало транзакции в режиме из OPTIONS.
+
+        В режиме IMMEDIATE блокировка записи берётся сразу. Отложенная
+        транзакция, которая сначала читает, а потом пишет, получает ошибку
+        `database is locked` без ожидания busy_timeout, если другое
+        соединение уже пишет.
+        """
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')